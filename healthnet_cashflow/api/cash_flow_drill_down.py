@@ -0,0 +1,32 @@
+import json
+
+import frappe
+from frappe import _
+
+REPORT_NAME = "Custom Cash Flow"
+
+
+@frappe.whitelist()
+def get_cash_flow_cell_entries(filters, section, period_key="total", cursor=None, page_length=100):
+    """
+    GL Entries behind one Custom Cash Flow cell (`section` row, `period_key`
+    column), loaded on demand in pages. Pass the returned `next_cursor` to
+    fetch the next page.
+    """
+    if not frappe.get_cached_doc("Report", REPORT_NAME).is_permitted():
+        frappe.throw(_("You don't have access to Report: {0}").format(REPORT_NAME), frappe.PermissionError)
+
+    frappe.has_permission("GL Entry", "read", throw=True)
+
+    from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.custom_cash_flow import (
+        validate_and_prepare_filters,
+    )
+    from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.drill_down import get_cell_entries
+
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+
+    filters = frappe._dict(filters)
+    validate_and_prepare_filters(filters)
+
+    return get_cell_entries(filters, section, period_key, cursor, page_length)
@@ -0,0 +1,139 @@
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
+
+import frappe
+from frappe import _
+from frappe.utils import cint, cstr
+from werkzeug.wrappers import Response
+
+REPORT_NAME = "Custom Cash Flow"
+CHUNK_SIZE = 64 * 1024
+
+
+@frappe.whitelist()
+def export_cash_flow(filters, file_format="CSV", include_accounts=0):
+    """
+    Custom Cash Flow as a CSV or Excel download, streamed while the report is
+    computed instead of going through the generic report export.
+
+    CSV goes out section by section; Excel is written row by row to a
+    temporary file (write-only workbook) and streamed from there.
+    """
+    if not frappe.get_doc("Report", REPORT_NAME).is_permitted():
+        frappe.throw(_("You don't have access to Report: {0}").format(REPORT_NAME), frappe.PermissionError)
+
+    from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.custom_cash_flow import (
+        validate_and_prepare_filters,
+    )
+
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+
+    if file_format not in ("CSV", "Excel"):
+        frappe.throw(_("File Format must be CSV or Excel"))
+
+    # fail before the response starts: errors cannot be reported mid-stream
+    validate_and_prepare_filters(frappe._dict(filters))
+
+    context = (frappe.local.site, frappe.local.sites_path, frappe.session.user)
+    filename = "Custom Cash Flow " + cstr(filters.get("company") or "")
+
+    if file_format == "CSV":
+        return Response(
+            stream_with_connection(context, iter_csv, filters, cint(include_accounts)),
+            mimetype="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.csv"'},
+            direct_passthrough=True,
+        )
+
+    return Response(
+        stream_with_connection(context, iter_xlsx, filters, cint(include_accounts)),
+        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.xlsx"'},
+        direct_passthrough=True,
+    )
+
+
+def stream_with_connection(context, method, *args):
+    """
+    Iterate `method(*args)` with a site context and database connection of its
+    own: the response body is consumed after the request's connection is closed.
+    """
+    site, sites_path, user = context
+    frappe.init(site=site, sites_path=sites_path)
+    try:
+        frappe.connect()
+        frappe.set_user(user)
+        yield from method(*args)
+    finally:
+        frappe.destroy()
+
+
+def iter_lines(filters, include_accounts):
+    """Header line, then one line per report row (plus its accounts with `include_accounts`)."""
+    from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.custom_cash_flow import (
+        iter_cash_flow,
+    )
+    from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.drill_down import get_cell_accounts
+
+    filters = frappe._dict(filters)
+    rows = iter_cash_flow(filters)
+    columns = next(rows)
+    # the first column is the section label; hidden columns (currency) are left out
+    value_columns = [column for column in columns[1:] if not column.get("hidden")]
+    fieldnames = [column["fieldname"] for column in value_columns]
+
+    yield [cstr(columns[0].get("label")), *(cstr(column.get("label")) for column in value_columns)]
+
+    for row in rows:
+        if not row:
+            yield []
+            continue
+
+        indent = "    " * cint(row.get("indent"))
+        label = cstr(row.get("section_name") or row.get("section") or row.get("account_name")).strip("'")
+        yield [indent + label, *(row.get(fieldname) for fieldname in fieldnames)]
+
+        if include_accounts and row.get("section"):
+            # rows no longer carry their accounts: resolve them like the drill-down
+            for account in get_cell_accounts(filters, row["section"]) or []:
+                yield [indent + "    " + account]
+
+
+def iter_csv(filters, include_accounts):
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    for idx, line in enumerate(iter_lines(filters, include_accounts)):
+        writer.writerow(line)
+
+        # flush the header at once, then at every blank line (section end) or when the buffer is full
+        if not idx or not line or buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_xlsx(filters, include_accounts):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(REPORT_NAME[:31])
+    for line in iter_lines(filters, include_accounts):
+        sheet.append(line)
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        workbook.save(path)
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield chunk
+    finally:
+        os.remove(path)
@@ -0,0 +1,38 @@
+import frappe
+import json
+from frappe.desk.query_report import run
+from frappe.utils import cint
+
+from healthnet_cashflow.utils.coalesce import run_coalesced
+from healthnet_cashflow.utils.prepared_report import run_in_background
+from healthnet_cashflow.utils.report_payload import to_columnar, validate_payload_format
+
+
+@frappe.whitelist()
+def get_cash_flow_report(filters, background=0, payload_format="dict"):
+    """
+    Custom Cash Flow result. `payload_format="columnar"` returns the compact
+    form of `to_columnar` instead of one dict per row.
+    """
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+
+    validate_payload_format(payload_format)
+
+    if cint(background):
+        return run_in_background("Custom Cash Flow", filters)
+
+    result = run_coalesced(
+        "Custom Cash Flow",
+        filters,
+        run,
+        report_name="Custom Cash Flow",
+        filters=json.dumps(filters),
+        ignore_prepared_report=True,
+        are_default_filters=False,
+    )
+
+    if payload_format == "columnar":
+        return to_columnar(result)
+
+    return result
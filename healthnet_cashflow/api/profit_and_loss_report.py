@@ -1,6 +1,10 @@
 import frappe
 import json
 from frappe.desk.query_report import run
+from frappe.utils import cint
+
+from healthnet_cashflow.utils.coalesce import run_coalesced
+from healthnet_cashflow.utils.prepared_report import run_in_background
 
 # @frappe.whitelist()
 # def get_profit_and_loss_report():
@@ -32,11 +36,17 @@ from frappe.desk.query_report import run
 
 
 @frappe.whitelist()
-def get_profit_and_loss_report(filters=None):
+def get_profit_and_loss_report(filters=None, background=0):
     if isinstance(filters, str):
         filters = json.loads(filters)
 
-    result = run(
+    if cint(background):
+        return run_in_background("Profit and Loss Statement", filters)
+
+    result = run_coalesced(
+    "Profit and Loss Statement",
+    filters,
+    run,
     report_name="Profit and Loss Statement",
     filters=filters,   # ← PASS DICT DIRECTLY
     ignore_prepared_report=False,
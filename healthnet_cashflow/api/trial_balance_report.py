@@ -1,7 +1,12 @@
 import frappe
 import json
 from frappe.desk.query_report import run
+from frappe.utils import cint
+
+from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import get_accounting_dimensions
 from erpnext.accounts.utils import get_fiscal_year
+from healthnet_cashflow.utils.coalesce import run_coalesced
+from healthnet_cashflow.utils.prepared_report import run_in_background
 
 # @frappe.whitelist()
 # def get_trial_balance_report():
@@ -32,7 +37,10 @@ from erpnext.accounts.utils import get_fiscal_year
 
 
 @frappe.whitelist()
-def get_trial_balance_report(filters):
+def get_trial_balance_report(filters, background=0):
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+
     filters = frappe._dict(filters)
 
     if filters.filter_based_on == "Fiscal Year":
@@ -70,8 +78,18 @@ def get_trial_balance_report(filters):
         "show_net_values": 1,
     }
 
+    # accounting dimension filters (added to the report by erpnext.utils.add_dimensions)
+    for dimension in get_accounting_dimensions():
+        if filters.get(dimension):
+            tb_filters[dimension] = filters.get(dimension)
+
+    if cint(background):
+        return run_in_background("Trial Balance", tb_filters)
 
-    return run(
+    return run_coalesced(
+        "Trial Balance",
+        tb_filters,
+        run,
         report_name="Trial Balance",
         filters=json.dumps(tb_filters),
         ignore_prepared_report=False,
@@ -0,0 +1,280 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+"""
+Synthetic ledgers for benchmarking the Custom Cash Flow report.
+
+	bench --site <site> execute healthnet_cashflow.benchmarks.ledger.make_synthetic_ledger \
+		--kwargs "{'company': 'Bench Co 100k', 'gl_entries': 100000, 'accounts': 500}"
+
+GL Entries are bulk inserted in chunks (no document validation), so 10M rows
+can be generated with flat memory use.
+"""
+
+import random
+
+import frappe
+from frappe.utils import add_days, date_diff, getdate, now
+from frappe.utils.nestedset import rebuild_tree
+
+from healthnet_cashflow.utils.period_balance import rebuild_period_balances
+
+ACCOUNT_TYPES = (
+    ("Asset", "Receivable"),
+    ("Asset", "Stock"),
+    ("Asset", "Fixed Asset"),
+    ("Asset", "Bank"),
+    ("Asset", "Cash"),
+    ("Liability", "Payable"),
+    ("Equity", "Equity"),
+    ("Income", "Income Account"),
+    ("Expense", "Expense Account"),
+    ("Expense", "Depreciation"),
+)
+
+
+def make_synthetic_ledger(
+    company,
+    abbr=None,
+    fiscal_year="Bench 2025",
+    year_start_date="2025-01-01",
+    year_end_date="2025-12-31",
+    accounts=200,
+    gl_entries=10000,
+    cost_centers=10,
+    cost_center_depth=2,
+    currency="NGN",
+    country="Nigeria",
+    chunk_size=10000,
+    seed=42,
+):
+    """Create `company` with the given chart size, cost center tree and GL Entry volume."""
+    rng = random.Random(seed)
+    abbr = abbr or "".join(word[0] for word in company.split()).upper()[:5]
+
+    frappe.flags.ignore_update_nsm = True
+    try:
+        make_fiscal_year(fiscal_year, year_start_date, year_end_date)
+        make_company(company, abbr, currency, country)
+        account_names = make_accounts(company, abbr, accounts)
+        cost_center_names = make_cost_centers(company, abbr, cost_centers, cost_center_depth)
+    finally:
+        frappe.flags.ignore_update_nsm = False
+
+    rebuild_tree("Account")
+    rebuild_tree("Cost Center")
+    frappe.db.commit()
+
+    make_gl_entries(
+        company,
+        abbr,
+        fiscal_year,
+        getdate(year_start_date),
+        getdate(year_end_date),
+        account_names,
+        cost_center_names,
+        gl_entries,
+        currency,
+        chunk_size,
+        rng,
+    )
+
+    # bulk inserted entries bypass the GL Entry doc_events
+    rebuild_period_balances(company)
+    frappe.db.commit()
+
+    return {
+        "company": company,
+        "fiscal_year": fiscal_year,
+        "accounts": len(account_names),
+        "cost_centers": len(cost_center_names),
+        "gl_entries": gl_entries,
+    }
+
+
+def make_fiscal_year(fiscal_year, year_start_date, year_end_date):
+    if not frappe.db.exists("Fiscal Year", fiscal_year):
+        frappe.get_doc(
+            {
+                "doctype": "Fiscal Year",
+                "year": fiscal_year,
+                "year_start_date": year_start_date,
+                "year_end_date": year_end_date,
+            }
+        ).insert(ignore_permissions=True)
+
+
+def make_company(company, abbr, currency, country):
+    if not frappe.db.exists("Company", company):
+        frappe.get_doc(
+            {
+                "doctype": "Company",
+                "company_name": company,
+                "abbr": abbr,
+                "default_currency": currency,
+                "country": country,
+                "create_chart_of_accounts_based_on": "Standard Template",
+                "chart_of_accounts": "Standard",
+            }
+        ).insert(ignore_permissions=True)
+
+
+def make_accounts(company, abbr, count):
+    """Leaf accounts spread over the cash flow account types; returns every leaf account of `company`."""
+    roots = {
+        d.root_type: d.name
+        for d in frappe.get_all(
+            "Account",
+            filters={"company": company, "parent_account": ("is", "not set")},
+            fields=["name", "root_type"],
+        )
+    }
+
+    for idx in range(count):
+        root_type, account_type = ACCOUNT_TYPES[idx % len(ACCOUNT_TYPES)]
+        group = make_account(f"Bench {account_type}", abbr, company, roots[root_type], root_type, is_group=1)
+        make_account(
+            f"Bench {account_type} {idx:06d}",
+            abbr,
+            company,
+            group,
+            root_type,
+            account_type=account_type if account_type not in ("Income Account", "Expense Account") else "",
+        )
+
+    return frappe.get_all("Account", filters={"company": company, "is_group": 0}, pluck="name")
+
+
+def make_account(account_name, abbr, company, parent_account, root_type, is_group=0, account_type=""):
+    name = f"{account_name} - {abbr}"
+    if not frappe.db.exists("Account", name):
+        frappe.get_doc(
+            {
+                "doctype": "Account",
+                "account_name": account_name,
+                "company": company,
+                "parent_account": parent_account,
+                "root_type": root_type,
+                "is_group": is_group,
+                "account_type": account_type,
+            }
+        ).db_insert()
+
+    return name
+
+
+def make_cost_centers(company, abbr, count, depth):
+    """A cost center tree `depth` levels deep with `count` leaves; returns the leaves."""
+    root = frappe.db.get_value("Cost Center", {"company": company, "parent_cost_center": ("is", "not set")})
+    parents = [root]
+
+    for level in range(1, depth):
+        parents = [
+            make_cost_center(f"Bench CC L{level} {idx:04d}", abbr, company, parents[idx % len(parents)], 1)
+            for idx in range(max(1, count // (depth - level + 1)))
+        ]
+
+    return [
+        make_cost_center(f"Bench CC {idx:05d}", abbr, company, parents[idx % len(parents)], 0)
+        for idx in range(count)
+    ]
+
+
+def make_cost_center(cost_center_name, abbr, company, parent_cost_center, is_group):
+    name = f"{cost_center_name} - {abbr}"
+    if not frappe.db.exists("Cost Center", name):
+        frappe.get_doc(
+            {
+                "doctype": "Cost Center",
+                "cost_center_name": cost_center_name,
+                "company": company,
+                "parent_cost_center": parent_cost_center,
+                "is_group": is_group,
+            }
+        ).db_insert()
+
+    return name
+
+
+def make_gl_entries(
+    company,
+    abbr,
+    fiscal_year,
+    start_date,
+    end_date,
+    accounts,
+    cost_centers,
+    count,
+    currency,
+    chunk_size,
+    rng,
+):
+    """Balanced two-line journal vouchers, bulk inserted `chunk_size` rows at a time."""
+    fields = [
+        "name",
+        "creation",
+        "modified",
+        "owner",
+        "modified_by",
+        "docstatus",
+        "company",
+        "account",
+        "posting_date",
+        "fiscal_year",
+        "cost_center",
+        "debit",
+        "credit",
+        "debit_in_account_currency",
+        "credit_in_account_currency",
+        "account_currency",
+        "voucher_type",
+        "voucher_no",
+        "is_opening",
+        "is_cancelled",
+    ]
+    timestamp = now()
+    days = date_diff(end_date, start_date)
+    rows = []
+
+    for idx in range(0, count, 2):
+        voucher_no = f"BENCH-{abbr}-{idx // 2:09d}"
+        posting_date = add_days(start_date, rng.randint(0, days))
+        amount = round(rng.uniform(10, 100000), 2)
+        debit_account, credit_account = rng.sample(accounts, 2)
+
+        for line, (account, debit, credit) in enumerate(
+            ((debit_account, amount, 0), (credit_account, 0, amount))
+        ):
+            rows.append(
+                (
+                    f"{voucher_no}-{line}",
+                    timestamp,
+                    timestamp,
+                    "Administrator",
+                    "Administrator",
+                    1,
+                    company,
+                    account,
+                    posting_date,
+                    fiscal_year,
+                    rng.choice(cost_centers),
+                    debit,
+                    credit,
+                    debit,
+                    credit,
+                    currency,
+                    "Journal Entry",
+                    voucher_no,
+                    "No",
+                    0,
+                )
+            )
+
+        if len(rows) >= chunk_size:
+            frappe.db.bulk_insert("GL Entry", fields, rows)
+            frappe.db.commit()
+            rows = []
+
+    if rows:
+        frappe.db.bulk_insert("GL Entry", fields, rows)
+        frappe.db.commit()
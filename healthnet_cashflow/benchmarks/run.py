@@ -0,0 +1,174 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+"""
+Benchmark the Custom Cash Flow report and the Trial Balance / Profit and Loss
+API wrappers against a (synthetic) company.
+
+	bench --site <site> execute healthnet_cashflow.benchmarks.run.run_benchmark \
+		--kwargs "{'company': 'Bench Co 100k', 'fiscal_year': 'Bench 2025'}"
+
+Every stage records wall time, SQL query count, rows fetched, SQL time and
+peak Python memory. Results are written as JSON under
+`sites/<site>/benchmarks/`, tagged with the app's git commit, and two result
+files can be compared with `compare_benchmarks`.
+"""
+
+import json
+import os
+import subprocess
+import tracemalloc
+from time import perf_counter
+
+import frappe
+from frappe.utils import cint, now_datetime
+
+from healthnet_cashflow.utils.coalesce import clear_coalesced_results
+from healthnet_cashflow.utils.query_stats import QueryStats
+from healthnet_cashflow.utils.result_cache import clear_result_cache
+
+METRICS = ("wall_time", "queries", "rows", "peak_memory")
+
+
+def run_benchmark(
+    company,
+    fiscal_year,
+    periodicities=("Yearly", "Quarterly", "Monthly"),
+    repeat=3,
+    cold=True,
+    output=None,
+):
+    """Run every stage `repeat` times per periodicity and save the best run of each."""
+    frappe.set_user("Administrator")
+    results = {
+        "commit": get_git_commit(),
+        "site": frappe.local.site,
+        "company": company,
+        "fiscal_year": fiscal_year,
+        "gl_entries": frappe.db.count("GL Entry", {"company": company}),
+        "accounts": frappe.db.count("Account", {"company": company}),
+        "timestamp": str(now_datetime()),
+        "stages": {},
+    }
+
+    for periodicity in periodicities:
+        filters = get_benchmark_filters(company, fiscal_year, periodicity)
+
+        for stage, method in get_stages().items():
+            runs = [measure(method, filters, cold) for _ in range(max(cint(repeat), 1))]
+            results["stages"][f"{stage}:{periodicity}"] = min(runs, key=lambda d: d["wall_time"])
+
+    path = output or get_output_path(results["commit"])
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1, default=str)
+
+    return {"path": path, **results}
+
+
+def get_stages():
+    from healthnet_cashflow.api.profit_and_loss_report import get_profit_and_loss_report
+    from healthnet_cashflow.api.trial_balance_report import get_trial_balance_report
+    from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.custom_cash_flow import execute
+
+    return {
+        "custom_cash_flow.execute": lambda filters: execute(frappe._dict(filters)),
+        "get_trial_balance_report": lambda filters: get_trial_balance_report(dict(filters)),
+        "get_profit_and_loss_report": lambda filters: get_profit_and_loss_report(dict(filters)),
+    }
+
+
+def get_benchmark_filters(company, fiscal_year, periodicity):
+    year_start_date, year_end_date = frappe.db.get_value(
+        "Fiscal Year", fiscal_year, ["year_start_date", "year_end_date"]
+    )
+
+    return frappe._dict(
+        {
+            "company": company,
+            "filter_based_on": "Fiscal Year",
+            "from_fiscal_year": fiscal_year,
+            "to_fiscal_year": fiscal_year,
+            "period_start_date": str(year_start_date),
+            "period_end_date": str(year_end_date),
+            "periodicity": periodicity,
+            "cost_center": [],
+            "project": [],
+            "include_default_book_entries": 1,
+            "accumulated_values": 0,
+        }
+    )
+
+
+def measure(method, filters, cold=True):
+    if cold:
+        clear_caches()
+
+    tracemalloc.start()
+    start = perf_counter()
+    try:
+        with QueryStats() as stats:
+            method(filters)
+        wall_time = perf_counter() - start
+        _current, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        frappe.db.rollback()
+
+    return {"wall_time": round(wall_time, 6), "peak_memory": peak_memory, **stats.as_dict()}
+
+
+def clear_caches():
+    frappe.local.request_cache.clear()
+    clear_result_cache()
+    clear_coalesced_results()
+
+
+def compare_benchmarks(baseline, current, tolerance=0.1):
+    """Stages of `current` that are more than `tolerance` (relative) worse than `baseline`."""
+    baseline, current = load_results(baseline), load_results(current)
+    regressions = []
+
+    for stage, result in current["stages"].items():
+        base = baseline["stages"].get(stage)
+        if not base:
+            continue
+
+        for metric in METRICS:
+            if base[metric] and result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    {
+                        "stage": stage,
+                        "metric": metric,
+                        "baseline": base[metric],
+                        "current": result[metric],
+                        "change": round(result[metric] / base[metric] - 1, 4),
+                    }
+                )
+
+    return regressions
+
+
+def load_results(result):
+    if isinstance(result, dict):
+        return result
+
+    with open(result) as f:
+        return json.load(f)
+
+
+def get_output_path(commit):
+    folder = frappe.get_site_path("benchmarks")
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, f"{now_datetime():%Y%m%d-%H%M%S}-{commit or 'unknown'}.json")
+
+
+def get_git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=frappe.get_app_path("healthnet_cashflow", ".."),
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except Exception:
+        return None
@@ -0,0 +1,15 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class CashFlowPeriodBalance(Document):
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_index(
+        "Cash Flow Period Balance", ["company", "posting_date", "account"], "company_posting_date_account"
+    )
@@ -0,0 +1,80 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+
+def normalize_account_name(name):
+    return " ".join((name or "").split()).casefold()
+
+
+def split_account_number(account_name):
+    """Split a Trial Balance style "1100 - Debtors" label into ("1100", "Debtors")."""
+    head, sep, tail = (account_name or "").partition(" - ")
+    if sep and head and " " not in head and any(ch.isdigit() for ch in head):
+        return head, tail
+
+    return None, account_name or ""
+
+
+class AccountIndex:
+    """
+    Lookup tables over account rows (Trial Balance rows or Account records).
+
+    Rows are indexed by exact account name, normalized (case-folded) name and
+    account number. Every label lookup in the report goes through `find_all` so
+    that the matching rules are the same for all row builders:
+
+    1. exact account name
+    2. normalized name, with or without the account number prefix
+    3. account number
+    4. normalized substring, in row order (memoized per label)
+    """
+
+    def __init__(self, rows):
+        self.rows = [row for row in rows or [] if isinstance(row, dict)]
+        self.by_name = {}
+        self.by_normalized_name = {}
+        self.by_number = {}
+        self._substring_matches = {}
+
+        for row in self.rows:
+            account_name = row.get("account_name") or ""
+            number, bare_name = split_account_number(account_name)
+            number = row.get("account_number") or number
+
+            self.by_name.setdefault(account_name, []).append(row)
+
+            for key in {normalize_account_name(account_name), normalize_account_name(bare_name)}:
+                self.by_normalized_name.setdefault(key, []).append(row)
+
+            if number:
+                self.by_number.setdefault(number, []).append(row)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def find_all(self, label):
+        """All rows matching `label` under the first matching rule."""
+        if not label:
+            return []
+
+        rows = (
+            self.by_name.get(label)
+            or self.by_normalized_name.get(normalize_account_name(label))
+            or self.by_number.get(label)
+        )
+        if rows:
+            return rows
+
+        key = normalize_account_name(label)
+        if key not in self._substring_matches:
+            self._substring_matches[key] = [
+                row for row in self.rows if key in normalize_account_name(row.get("account_name"))
+            ]
+
+        return self._substring_matches[key]
+
+    def find(self, label):
+        """First row matching `label`, or None."""
+        rows = self.find_all(label)
+        return rows[0] if rows else None
+
@@ -0,0 +1,174 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+from array import array
+from itertools import cycle
+from operator import add, mul
+
+import frappe
+from frappe import _
+from frappe.utils import cint, cstr, flt, formatdate
+
+from erpnext.setup.utils import get_exchange_rate
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.multi_year import (
+    CLOSING_ROWS,
+    OPENING_ROWS,
+    RowLayout,
+    get_period_columns,
+    get_row_fields,
+    get_row_key,
+    merge_report_summary,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.period_grid import get_period_total
+
+
+def get_consolidated_companies(filters):
+    """
+    Companies of a consolidated report: the `companies` filter, or the selected
+    company and all its subsidiaries with `consolidate_subsidiaries`. Returns an
+    empty list for a single-company report.
+    """
+    companies = filters.get("companies") or []
+    if isinstance(companies, str):
+        companies = frappe.parse_json(companies) if companies.startswith("[") else [companies]
+
+    if cint(filters.get("consolidate_subsidiaries")):
+        companies = [filters.company, *frappe.db.get_descendants("Company", filters.company), *companies]
+
+    companies = list(dict.fromkeys(company for company in companies if company))
+    return companies if len(companies) > 1 else []
+
+
+def get_company_filters(filters, companies):
+    """One copy of `filters` per company, with the consolidation filters removed."""
+    if filters.get("cost_center"):
+        frappe.throw(_("Cost Center filter cannot be used in a consolidated report"))
+
+    company_filters = []
+    for company in companies:
+        company_filter = frappe._dict(filters.copy())
+        company_filter.pop("companies", None)
+        company_filter.pop("consolidate_subsidiaries", None)
+        company_filter.company = company
+        company_filters.append(company_filter)
+
+    return company_filters
+
+
+def get_presentation_currency(filters, companies):
+    return filters.get("presentation_currency") or frappe.get_cached_value(
+        "Company", filters.company or companies[0], "default_currency"
+    )
+
+
+def get_exchange_rates(company, currency, period_list, period_end_date):
+    """
+    Rate from `company`'s currency to `currency` for every period column, at the
+    period end date. Columns not in `period_list` use the report end date.
+    """
+    company_currency = frappe.get_cached_value("Company", company, "default_currency")
+    if company_currency == currency:
+        return {}
+
+    rates = {
+        period["key"]: get_required_exchange_rate(company_currency, currency, period["to_date"])
+        for period in period_list
+    }
+    rates[None] = get_required_exchange_rate(company_currency, currency, period_end_date)
+
+    return rates
+
+
+def get_required_exchange_rate(from_currency, to_currency, date):
+    """Exchange rate on `date`; a missing rate is an error, not a 1:1 conversion."""
+    rate = flt(get_exchange_rate(from_currency, to_currency, date))
+    if not rate:
+        frappe.throw(
+            _("No exchange rate from {0} to {1} on {2}. Please create a Currency Exchange record.").format(
+                from_currency, to_currency, formatdate(date)
+            ),
+            title=_("Missing Exchange Rate"),
+        )
+
+    return rate
+
+
+def merge_company_results(results, rates, currency, accumulated_values=False):
+    """
+    Merge the `execute()` results of several companies into one result in
+    `currency`. Rows are matched by section; every company's rows x periods
+    matrix is converted with its per-period rates and summed in one pass over
+    the array, totals are recomputed from the converted values.
+
+    `rates` holds one mapping per result as returned by get_exchange_rates.
+    Returns (columns, data, report_summary).
+    """
+    columns = results[0][0]
+    period_keys = [column["fieldname"] for column in get_period_columns(columns)]
+    width = len(period_keys)
+
+    # the first company's rows (including the blank separators) give the layout;
+    # every row gets a slot in the merged rows x periods matrix
+    value_keys = (*period_keys, "total")
+    layout = RowLayout([get_row_fields(row, value_keys) for row in results[0][1]])
+    slots = {key: slot for slot, key in enumerate(layout.rows)}
+
+    for result in results[1:]:
+        for row, _merged in layout.merge(result[1], value_keys):
+            slots.setdefault(get_row_key(row), len(slots))
+
+    rows = layout.rows
+    data = layout.get_data()
+
+    # converted values of every company, summed matrix-wise
+    totals = array("d", [0.0]) * (len(slots) * width)
+    has_values = [False] * len(slots)
+
+    for result, company_rates in zip(results, rates, strict=True):
+        period_rates = [company_rates.get(key, company_rates.get(None, 1.0)) for key in period_keys]
+        values = array("d", [0.0]) * (len(slots) * width)
+
+        for row in result[1]:
+            if not row:
+                continue
+
+            key = get_row_key(row)
+            slot = slots[key]
+            row_values = [row.get(period_key) for period_key in period_keys]
+            if any(value is not None for value in row_values):
+                has_values[slot] = True
+            values[slot * width : (slot + 1) * width] = array("d", map(flt, row_values))
+
+            if row.get("currency"):
+                rows[key]["currency"] = currency
+
+        totals = array("d", map(add, totals, map(mul, values, cycle(period_rates))))
+
+    for key, slot in slots.items():
+        row = rows[key]
+        if has_values[slot]:
+            row.update(zip(period_keys, totals[slot * width : (slot + 1) * width], strict=True))
+            row["total"] = get_row_total(row, period_keys, accumulated_values)
+        else:
+            row.update(dict.fromkeys(period_keys))
+            row["total"] = None
+
+    report_summary = merge_report_summary(
+        [
+            convert_report_summary(result[4], company_rates.get(None, 1.0), currency)
+            for result, company_rates in zip(results, rates, strict=True)
+        ]
+    )
+
+    return columns, data, report_summary
+
+
+def get_row_total(row, period_keys, accumulated_values):
+    section = cstr(row.get("section"))
+    balance_type = "opening" if section in OPENING_ROWS else "closing" if section in CLOSING_ROWS else None
+
+    return get_period_total([flt(row.get(key)) for key in period_keys], accumulated_values, balance_type)
+
+
+def convert_report_summary(report_summary, rate, currency):
+    return [{**item, "value": flt(item["value"]) * rate, "currency": currency} for item in report_summary or []]
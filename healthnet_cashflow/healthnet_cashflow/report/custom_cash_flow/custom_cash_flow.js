@@ -25,5 +25,72 @@ frappe.query_reports["Custom Cash Flow"]["filters"].push(
 		fieldname: "show_opening_and_closing_balance",
 		label: __("Show Opening and Closing Balance"),
 		fieldtype: "Check",
+	},
+	{
+		fieldname: "companies",
+		label: __("Consolidate Companies"),
+		fieldtype: "MultiSelectList",
+		get_data: function (txt) {
+			return frappe.db.get_link_options("Company", txt);
+		},
+	},
+	{
+		fieldname: "consolidate_subsidiaries",
+		label: __("Consolidate Subsidiaries"),
+		fieldtype: "Check",
+	},
+	{
+		fieldname: "split_by",
+		label: __("Split By"),
+		fieldtype: "Select",
+		options: ["", "Cost Center", "Project"],
+	},
+	{
+		fieldname: "debug_trace",
+		label: __("Debug Trace"),
+		fieldtype: "Check",
+		hidden: 1,
+	},
+	{
+		fieldname: "debug_profile",
+		label: __("Debug Profile"),
+		fieldtype: "Check",
+		hidden: 1,
 	}
 );
+
+frappe.provide("healthnet_cashflow.cash_flow");
+
+// Fetch the report through the API, for scripts and API clients; the report view
+// itself always loads dict rows. payload_format is "dict" (one object per row) or
+// "columnar" (row metadata + a rows x columns value matrix, see report_payload.py)
+healthnet_cashflow.cash_flow.get_report = function (filters, payload_format = "dict") {
+	return frappe
+		.call({
+			method: "healthnet_cashflow.api.cash_flow_report.get_cash_flow_report",
+			args: { filters: filters, payload_format: payload_format },
+		})
+		.then((r) => r.message);
+};
+
+// Rebuild the dict rows (with their blank spacers) of a columnar payload
+healthnet_cashflow.cash_flow.expand_columnar = function (payload) {
+	const fields = payload.row_fields;
+	const fieldnames = payload.value_columns.map((column) => column.fieldname);
+	const rows = payload.rows.map((values, idx) => {
+		const row = {};
+		fields.forEach((field, i) => {
+			if (field !== "has_currency") row[field] = values[i];
+		});
+		row.currency = values[fields.length - 1] ? payload.currency : null;
+		fieldnames.forEach((fieldname, i) => (row[fieldname] = payload.values[idx][i]));
+		return row;
+	});
+
+	payload.spacers.forEach((position) => rows.splice(position, 0, {}));
+
+	return {
+		columns: [...payload.columns, ...payload.value_columns],
+		result: rows,
+	};
+};
@@ -2,227 +2,279 @@
 # For license information, please see license.txt
 
 
-from datetime import timedelta
+from time import time
 
 import frappe
 from frappe import _
-from frappe.query_builder import DocType
-from frappe.utils import cstr, flt
-from pypika import Order
+from frappe.utils import cint, flt, getdate
 
 from erpnext.accounts.report.financial_statements import (
     get_columns,
-    get_cost_centers_with_children,
-    get_data,
     get_filtered_list_for_consolidated_report,
     get_period_list,
-    set_gl_entries_by_account,
-)
-from erpnext.accounts.report.profit_and_loss_statement.profit_and_loss_statement import (
-    get_net_profit_loss,
 )
 from erpnext.accounts.utils import get_fiscal_year
-from healthnet_cashflow.api.profit_and_loss_report import get_profit_and_loss_report
-from healthnet_cashflow.api.trial_balance_report import get_trial_balance_report
-
-
-def build_cashflow_single_value_row(
-    label,
-    value,
-    period_list,
-    parent_section,
-    currency,
-    indent=1,
-    include_in_op_total=True,
-    include_in_net_cash=False,
-):
-    row = {
-        "section_name": _(label),
-        "section": _(label),
-        "indent": indent,
-        "parent_section": parent_section,
-        "currency": currency,
-        "include_in_op_total": include_in_op_total,
-        "include_in_net_cash": include_in_net_cash,
-        "total": value,
-    }
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.account_index import AccountIndex
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.consolidated import (
+    get_company_filters,
+    get_consolidated_companies,
+    get_exchange_rates,
+    get_presentation_currency,
+    merge_company_results,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.ledger_scan import (
+    get_account_subtree,
+    get_ledger_scan,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.multi_year import (
+    get_fiscal_year_filters,
+    merge_fiscal_year_results,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.period_grid import (
+    NET_CASH,
+    OP_PROFIT,
+    PeriodGrid,
+    get_period_total,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.period_ledger import get_period_ledger
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.pl_snapshot import (
+    get_pl_snapshot,
+    match_accounts,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.report_profile import (
+    get_profile,
+    start_profile,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.report_trace import (
+    get_trace,
+    start_trace,
+    trace,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.split import (
+    get_split_chart_columns,
+    get_split_filters,
+    merge_split_results,
+    validate_split_filters,
+)
+from healthnet_cashflow.utils.parallel import run_in_parallel
+from healthnet_cashflow.utils.result_cache import get_cached_result, set_cached_result
+
+# trial balance labels of the property, plant & equipment rows
+PPE_LABEL = "PROPERTY, PLANT & EQUIPMENT AIRPORT"
+ACCUMULATED_DEPRECIATION_LABEL = "ACCUMULATED DEPRECIATION"
 
-    for period in period_list:
-        row[period["key"]] = value
+
+def get_period_values_row(period_list, values, accumulated_values=False, balance_type=None):
+    """
+    Row dict for a list of per-period `values`, with their `get_period_total`.
+    """
+    values = values or [0.0] * len(period_list)
+    row = {period["key"]: value for period, value in zip(period_list, values, strict=True)}
+    row["total"] = get_period_total(values, accumulated_values, balance_type)
 
     return row
 
 
+def get_period_bounds(period_list, accumulated_values):
+    """(first, last) period index covered by the value of each period."""
+    return [(0 if accumulated_values else idx, idx) for idx in range(len(period_list))]
 
-def get_tb_diff_by_label(label, filters):
-    from erpnext.accounts.report.trial_balance import trial_balance
-    from frappe.utils import flt
-    import frappe
 
-    tb_filters = frappe._dict({
-        "company": filters.company,
-        "fiscal_year": filters.from_fiscal_year,
-        "from_date": filters.period_start_date,
-        "to_date": filters.period_end_date,
-        "show_net_values": 1,
-        "with_period_closing_entry_for_opening": 1,
-        "with_period_closing_entry_for_current_period": 1,
-        "include_default_book_entries": 1,
-    })
+def get_balance_changes(balances, period_list, accumulated_values):
+    """Credit - debit movement of `balances` for every period."""
+    return [
+        balances.opening_balance(first) - balances.closing_balance(last)
+        for first, last in get_period_bounds(period_list, accumulated_values)
+    ]
+
 
-    columns, rows = trial_balance.execute(tb_filters)
+def get_tb_diff_by_label(label, period_list, filters):
+    ledger = get_period_ledger(period_list, filters)
+    balances = ledger.get_balances(label)
 
-    frappe.log_error(
-        title="TB DEBUG ROW COUNT",
-        message=f"Rows returned: {len(rows) if rows else 0}"
+    if not balances:
+        trace("TB LABEL NOT FOUND", label)
+        return None
+
+    values = get_balance_changes(balances, period_list, filters.accumulated_values)
+
+    trace(
+        "TB LABEL MATCH FOUND",
+        f"{ledger.get_account(label).account_name} => Difference = {values}",
     )
 
-    for row in rows or []:
-        if not isinstance(row, dict):
+    return values
+
+
+def get_tb_diff_by_labels(labels, period_list, filters):
+    """Sum of the balance changes of every account matching one of `labels`."""
+    total_difference = [0.0] * len(period_list)
+
+    for label in labels:
+        values = get_tb_diff_by_label(label, period_list, filters)
+        if values is None:
             continue
 
-        account_label = row.get("account_name", "")
+        total_difference = [a + b for a, b in zip(total_difference, values, strict=True)]
 
-        # LABEL MATCH (case-insensitive)
-        if label.lower() in account_label.lower():
-            opening_dr = flt(row.get("opening_debit", 0))
-            closing_dr = flt(row.get("closing_debit", 0))
-            opening_cr = flt(row.get("opening_credit", 0))
-            closing_cr = flt(row.get("closing_credit", 0))
+    if len(labels) > 1:
+        trace("TB LABELS TOTAL", f"{' + '.join(labels)} = {total_difference}")
 
-            difference = (((closing_dr - opening_dr) * -1) + (closing_cr - opening_cr))
+    return total_difference
 
-            frappe.log_error(
-                title="TB LABEL MATCH FOUND",
-                message=f"{account_label} => Opening Dr = {opening_dr}, Closing Dr = {closing_dr}, Difference = {difference}"
-            )
 
-            return difference
+def execute(filters=None):
+    if not filters:
+        frappe.throw(_("Filters are required"))
 
-    frappe.log_error(
-        title="TB LABEL NOT FOUND",
-        message=label
-    )
+    filters = frappe._dict(filters)
 
-    return 0
+    validate_and_prepare_filters(filters)
 
+    result = get_cached_result(filters)
+    if result is not None:
+        return result
+
+    started = time()
+    companies = get_consolidated_companies(filters)
+    if filters.get("split_by"):
+        result = execute_split(filters)
+    elif companies:
+        result = execute_consolidated(filters, companies)
+    elif filters.from_fiscal_year != filters.to_fiscal_year:
+        result = execute_multi_year(filters)
+    else:
+        result = execute_single_year(filters)
 
-def get_withholding_tax_total(filters):
-    from erpnext.accounts.report.trial_balance import trial_balance
-    from frappe.utils import flt
-    import frappe
+    set_cached_result(filters, result, started)
+    return result
 
-    # Labels to match
-    labels = ["WITHHOLDING TAX 7.5%", "WITHHOLDING TAX 3%"]
 
-    tb_filters = frappe._dict({
-        "company": filters.company,
-        "fiscal_year": filters.from_fiscal_year,
-        "from_date": filters.period_start_date,
-        "to_date": filters.period_end_date,
-        "show_zero_values": 1,
-        "show_net_values": 1,
-    })
+def execute_single_year(filters):
+    start_trace(filters)
+    profile = start_profile(filters)
 
-    columns, rows = trial_balance.execute(tb_filters)
+    period_list = get_report_period_list(filters)
+    summary_data = {}
+    data = list(iter_cash_flow_data(filters, period_list, summary_data))
 
-    frappe.log_error(
-        title="TB DEBUG ROW COUNT",
-        message=f"Rows returned: {len(rows) if rows else 0}"
-    )
+    with profile.stage("get_columns"):
+        columns = get_report_columns(filters, period_list)
 
-    total_difference = 0
+    company_currency = frappe.get_cached_value("Company", filters.company, "default_currency")
 
-    for label in labels:
-        found = False
-        for row in rows or []:
-            if not isinstance(row, dict):
-                continue
-
-            account_label = row.get("account_name", "")
-
-            # LABEL MATCH (case-insensitive)
-            if label.lower() in account_label.lower():
-                opening_cr = flt(row.get("opening_credit", 0))
-                closing_cr = flt(row.get("closing_credit", 0))
-                opening_dr = flt(row.get("opening_debit", 0))
-                closing_dr = flt(row.get("closing_debit", 0))
-
-                difference = (((closing_cr - opening_cr)) + (closing_dr - opening_dr) * -1)
-                total_difference += difference
-                found = True
-
-                frappe.log_error(
-                    title=f"TB WITHHOLDING TAX MATCH FOUND: {label}",
-                    message=f"{account_label} => Opening Cr = {opening_cr}, Closing Cr = {closing_cr}, Difference = {difference}"
-                )
-                break  # stop searching for this label
+    with profile.stage("get_chart_data"):
+        chart = get_chart_data(columns, data, company_currency)
 
-        if not found:
-            frappe.log_error(
-                title=f"TB WITHHOLDING TAX NOT FOUND: {label}",
-                message=f"{label} not found in Trial Balance"
-            )
+    report_summary = get_report_summary(summary_data, company_currency)
 
-    frappe.log_error(
-        title="TB WITHHOLDING TAX TOTAL",
-        message=f"Total Difference (7.5% + 3%) = {total_difference}"
-    )
+    get_trace().flush()
+    profile.log(filters)
 
-    return total_difference
+    message = profile.as_html() if cint(filters.get("debug_profile")) else None
 
+    return columns, data, message, chart, report_summary
 
 
-def execute(filters=None):
-    if not filters:
-        frappe.throw(_("Filters are required"))
+def iter_cash_flow(filters):
+    """
+    Generator version of `execute()`: yields the columns, then the data rows.
 
+    A single-year report yields its rows section by section as they are
+    computed. Cached, split, multi-year and consolidated results are merged
+    from complete runs, so their rows follow once the result is ready.
+    """
     filters = frappe._dict(filters)
-
     validate_and_prepare_filters(filters)
-    period_list = get_period_list(
-        filters.from_fiscal_year,
-        filters.to_fiscal_year,
-        filters.period_start_date,
-        filters.period_end_date,
-        filters.filter_based_on,
-        filters.periodicity,
-        company=filters.company,
-    )
 
-    cash_flow_sections = get_cash_flow_accounts()
+    result = get_cached_result(filters)
+    if result is None and (
+        filters.get("split_by")
+        or get_consolidated_companies(filters)
+        or filters.from_fiscal_year != filters.to_fiscal_year
+    ):
+        result = execute(filters)
 
-    # compute net profit / loss
-    income = get_data(
-        filters.company,
-        "Income",
-        "Credit",
+    if result is not None:
+        yield result[0]
+        yield from result[1]
+        return
+
+    start_trace(filters)
+    start_profile(filters)
+
+    period_list = get_report_period_list(filters)
+    yield get_report_columns(filters, period_list)
+    yield from iter_cash_flow_data(filters, period_list, {})
+
+    get_trace().flush()
+
+
+def get_report_period_list(filters):
+    with get_profile().stage("get_period_list"):
+        return get_period_list(
+            filters.from_fiscal_year,
+            filters.to_fiscal_year,
+            filters.period_start_date,
+            filters.period_end_date,
+            filters.filter_based_on,
+            filters.periodicity,
+            company=filters.company,
+        )
+
+
+def get_report_columns(filters, period_list):
+    return get_columns(
+        filters.periodicity,
         period_list,
-        filters=filters,
-        accumulated_values=filters.accumulated_values,
-        ignore_closing_entries=True,
-        ignore_accumulated_values_for_fy=True,
-    )
-    expense = get_data(
+        filters.accumulated_values,
         filters.company,
-        "Expense",
-        "Debit",
-        period_list,
-        filters=filters,
-        accumulated_values=filters.accumulated_values,
-        ignore_closing_entries=True,
-        ignore_accumulated_values_for_fy=True,
+        True,
     )
 
-    net_profit_loss = get_net_profit_loss(income, expense, period_list, filters.company)
-    print(net_profit_loss)
 
-    data = []
-    summary_data = {}
+def iter_cash_flow_data(filters, period_list, summary_data):
+    """
+    Data rows of a single-year report, yielded section by section. Section
+    totals are added to `summary_data`.
+    """
+    profile = get_profile()
+
+    cash_flow_sections = get_cash_flow_accounts()
+    plan = get_fetch_plan(cash_flow_sections)
+    trace("FETCH PLAN", plan)
+
+    # the one ledger pass every row aggregates from
+    with profile.stage("get_ledger_scan"):
+        get_ledger_scan(period_list, filters)
+
+    with profile.stage("get_account_type_based_gl_data_from_scan"):
+        account_type_gl_data = get_account_type_based_gl_data_from_scan(
+            plan.gl_account_types,
+            period_list,
+            filters.accumulated_values,
+            filters,
+        )
+
+    # opening / closing cash always read the period ledger
+    with profile.stage("get_period_ledger"):
+        get_period_ledger(period_list, filters)
+
+    # and the net profit row the P&L
+    with profile.stage("get_pl_snapshot"):
+        pl_snapshot = get_pl_snapshot(period_list, filters)
+
+    with profile.stage("get_net_profit_loss"):
+        net_profit_loss = pl_snapshot.get_net_profit_loss(period_list, filters.company)
+
+    period_keys = [period["key"] for period in period_list]
+    grid = PeriodGrid([*period_keys, "total"])
     company_currency = frappe.get_cached_value("Company", filters.company, "default_currency")
 
     for cash_flow_section in cash_flow_sections:
-        section_data = []
+        section_rows = []
+        section_role = ("section", cash_flow_section["section_name"])
+        is_operations = cash_flow_section["section_name"] == "Operations"
         header_row = {
             "section_name": "'" + cash_flow_section["section_header"] + "'",
             "parent_section": None,
@@ -237,9 +289,12 @@ def execute(filters=None):
 
         header_row["total"] = None
 
-        data.append(header_row)
+        section_rows.append(header_row)
+
+        # last row of the operating profit, which is inserted after it
+        last_op_profit_row = None
 
-        if len(data) == 1:
+        if cash_flow_section is cash_flow_sections[0]:
             # add first net income in operations section
             if net_profit_loss:
                 net_profit_loss["account_name"] = "'Net Profit After Tax'"
@@ -251,326 +306,305 @@ def execute(filters=None):
                         "parent_section": cash_flow_sections[0]["section_header"],
                     }
                 )
-            
-                data.append(net_profit_loss)
-                section_data.append(net_profit_loss)
-
-        for row in cash_flow_section["account_types"]:
-            # ---------------- PPE MOVEMENTS (TB BASED) ----------------
-            if row["label"] == _("Purchase of PPE"):
-                row_data = get_ppe_movement_from_tb(
-                    period_list,
-                    filters,
-                    movement_type="purchase"
-                )
-
-            elif row["label"] == _("Proceeds from Asset Disposal"):
-                row_data = get_ppe_movement_from_tb(
-                    period_list,
-                    filters,
-                    movement_type="disposal"
-                )
-
-            # ---------------- INTEREST ----------------
-            elif row["label"] == _("Interest Expense"):
-                row_data = get_interest_expense_from_pl(period_list, filters)
-
-            elif row["label"] == _("Interest Paid"):
-                row_data = get_interest_expense_from_pl(period_list, filters)
-                
-            # ---------------- STATIC ZERO ----------------
-            elif row["label"] == _("Borrowings/Equity Movements"):
-                row_data = {p["key"]: 0 for p in period_list}
-                row_data["total"] = 0    
-
-            # ---------------- WORKING CAPITAL ----------------
-            elif row["label"] == _("Change in Trade Receivables"):
-                row_data = get_working_capital_change_from_tb(
-                    "Accounts Receivable", period_list, filters
-                )
-
-            elif row["label"] == _("Change in Inventory"):
-                row_data = get_working_capital_change_from_tb(
-                    "INVENTORY", period_list, filters
-                )
 
-            elif row["label"] == _("Change in Trade Payables"):
-                row_data = get_working_capital_change_from_tb(
-                    "Accounts Payable", period_list, filters
-                )
-
-            elif row["label"] == _("Loans and Advances (Assets)"):
-                loans_total = get_tb_diff_by_label("Loans and Advances (Assets)", filters) or 0
-                row_data = build_cashflow_single_value_row(
-                    label="Loans and Advances (Assets)",
-                    value=loans_total,
-                    period_list=period_list,
-                    parent_section=cash_flow_sections[0]["section_header"],
-                    currency=company_currency,
-                    indent=1
-                )
-
-            elif row["label"] == _("Prepayment"):
-                prepayment_total = get_tb_diff_by_label("PREPAYMENT", filters) or 0
-                row_data = build_cashflow_single_value_row(
-                    label="Prepayment",
-                    value=prepayment_total,
-                    period_list=period_list,
-                    parent_section=cash_flow_sections[0]["section_header"],
-                    currency=company_currency,
-                    indent=1
-                )
-
-            elif row["label"] == _("Tax Assets"):
-                tax_assets_total = get_tb_diff_by_label("Tax Assets", filters) or 0
-                row_data = build_cashflow_single_value_row(
-                    label="Tax Assets",
-                    value=tax_assets_total,
-                    period_list=period_list,
-                    parent_section=cash_flow_sections[0]["section_header"],
-                    currency=company_currency,
-                    indent=1
-                )
-
-            elif row["label"] == _("Investment"):
-                investment_total = get_tb_diff_by_label("Investment", filters) or 0
-                row_data = build_cashflow_single_value_row(
-                    label="Investment",
-                    value=investment_total,
-                    period_list=period_list,
-                    parent_section=cash_flow_sections[0]["section_header"],
-                    currency=company_currency,
-                    indent=1
-                )
-
-
-            elif row["label"] == _("Withholding Tax"):
-                row_data = build_cashflow_single_value_row(
-                    label="Withholding Tax",
-                    value=get_withholding_tax_total(filters),
-                    period_list=period_list,
-                    parent_section=cash_flow_sections[0]["section_header"],
-                    currency=company_currency,
-                    indent=1
-                )
-                
-
-
-            # ---------------- DEFAULT (ACCOUNT TYPE BASED) ----------------
-            else:
-                row_data = get_account_type_based_data(
-                    filters.company,
-                    row["account_type"],
-                    period_list,
-                    filters.accumulated_values,
-                    filters
-                )
+                section_rows.append(net_profit_loss)
+                grid.add(net_profit_loss, (OP_PROFIT,))
+                last_op_profit_row = net_profit_loss
 
+        for row in cash_flow_section["account_types"]:
+            with profile.stage(f"row:{row['label']}"):
+                row_data = get_cash_flow_row_data(row, period_list, filters, account_type_gl_data)
 
-            accounts = frappe.get_all(
-                "Account",
-                filters={
-                    "account_type": row["account_type"],
-                    "is_group": 0,
-                },
-                pluck="name",
-            )
             row_data.update(
                 {
                     "section_name": row["label"],
                     "section": row["label"],
                     "indent": 1,
-                    "accounts": accounts,
                     "parent_section": cash_flow_section["section_header"],
                     "currency": company_currency,
-                    "include_in_op_total": row["label"] in (
-                        _("Change in Trade Receivables"),
-                        _("Change in Inventory"),
-                        _("Change in Trade Payables"),
-                        _("Loans and Advances (Assets)"),
-                        _("Prepayment"),
-                        _("Tax Assets"),
-                        _("Investment"),
-                        _("Withholding Tax"),
-                    ),
-                    "include_in_net_cash": row["label"] in (
-                        _("Interest Paid"),
-                        _("Borrowings/Equity Movements"),
-                    ),
+                    "include_in_op_total": row.get("include_in_op_total", False),
+                    "include_in_net_cash": row.get("include_in_net_cash", False),
                 }
             )
-            data.append(row_data)
-            section_data.append(row_data)
-
-        
-        if cash_flow_section["section_name"] == "Operations":
+            section_rows.append(row_data)
+
+            # the operating section totals only the rows declared as part of it
+            roles = []
+            if row.get("include_in_op_profit"):
+                roles.append(OP_PROFIT)
+                last_op_profit_row = row_data
+            if not is_operations or row.get("include_in_op_total"):
+                roles.append(section_role)
+            grid.add(row_data, roles)
+
+        if is_operations:
+            op_profit_values = grid.sum(OP_PROFIT)
             op_profit = {
                 "section_name": _("Operating Profit before Working Capital Changes"),
                 "section": _("Operating Profit before Working Capital Changes"),
                 "indent": 1,
                 "parent_section": cash_flow_section["section_header"],
                 "currency": company_currency,
-                "total": 0,
                 "include_in_op_total": True,
+                **grid.as_row(op_profit_values, period_keys),
             }
+            op_profit["total"] = get_period_total(
+                op_profit_values[: len(period_keys)], filters.accumulated_values
+            )
+            grid.add(op_profit, (section_role,))
 
-            for period in period_list:
-                key = period["key"]
-                value = 0
-
-                for row in section_data:
-                    row_name = (row.get("section") or "").replace("'", "")
-
-                    if row_name in (
-                        "Net Profit After Tax",
-                        "Depreciation & Amortisation",
-                        "Interest Expense",
-                    ):
-                        value += row.get(key, 0)
-
-                op_profit[key] = value
-                op_profit["total"] += value
-
-            # Insert AFTER Interest Expense
-            insert_after_label = "Interest Expense"
-
-            # Find index in section_data
-            insert_index = None
-            for idx, row in enumerate(section_data):
-                if row.get("section", "").replace("'", "") == insert_after_label:
-                    insert_index = idx + 1
-                    break
-
-            # Fallback (should not happen)
-            if insert_index is None:
-                insert_index = len(section_data)
-
-            # Insert in section_data
-            section_data.insert(insert_index, op_profit)
-
-            # Insert in main data list (same relative position)
-            data_index = None
-            for idx, row in enumerate(data):
-                if row.get("section", "").replace("'", "") == insert_after_label:
-                    data_index = idx + 1
-                    break
-
-            if data_index is None:
-                data.append(op_profit)
-            else:
-                data.insert(data_index, op_profit)
-
+            # Insert AFTER Interest Expense (the last operating profit row)
+            insert_index = next(
+                (idx + 1 for idx, row in enumerate(section_rows) if row is last_op_profit_row),
+                len(section_rows),
+            )
+            section_rows.insert(insert_index, op_profit)
+
+        with profile.stage(f"add_total_row_account:{cash_flow_section['section_name']}"):
+            total_row = add_total_row_account(
+                section_rows,
+                grid,
+                section_role,
+                cash_flow_section["section_footer"],
+                period_list,
+                company_currency,
+                summary_data,
+                filters,
+            )
 
-        add_total_row_account(
-            data,
-            section_data,
-            cash_flow_section["section_footer"],
-            period_list,
-            company_currency,
-            summary_data,
-            filters,
-        )
-        
+        grid.add(total_row, (NET_CASH,))
+        yield from section_rows
 
+    net_cash_values = grid.sum(NET_CASH)[: len(period_keys)]
+    net_cash_total = get_period_total(net_cash_values, filters.accumulated_values)
     net_cash_row = {
-    "section_name": "'Net increase in cash and cash equivalents'",
-    "section": "'Net increase in cash and cash equivalents'",
-    "currency": company_currency,
+        "section_name": "'Net increase in cash and cash equivalents'",
+        "section": "'Net increase in cash and cash equivalents'",
+        "currency": company_currency,
+        **grid.as_row(net_cash_values, period_keys),
+        "total": net_cash_total,
     }
+    summary_data["Net increase in cash and cash equivalents"] = (
+        summary_data.get("Net increase in cash and cash equivalents", 0) + net_cash_total
+    )
 
-    for period in period_list:
-        key = period["key"]
-        value = 0
-
-        for row in data:
-            row_name = (row.get("section") or "").replace("'", "")
-
-            if row_name in (
-                "Net Cash from Operating Activities",
-                "Net Cash used Investing Activities",
-                "Net Cash from Financing Activities",
-            ):
-                value += row.get(key, 0)
-
-        net_cash_row[key] = value
-        summary_data["Net increase in cash and cash equivalents"] = (
-            summary_data.get("Net increase in cash and cash equivalents", 0) + value
-        )
-
-    net_cash_row["total"] = sum(net_cash_row.get(p["key"], 0) for p in period_list)
-
-    data.append(net_cash_row)
-    data.append({})
+    yield net_cash_row
+    yield {}
 
-    opening_row = get_cash_and_bank_balance(period_list, filters, "opening")
+    with profile.stage("get_cash_and_bank_balance"):
+        opening_row = get_cash_and_bank_balance(period_list, filters, "opening")
     opening_row.update({
         "section_name": "'Opening Cash and Bank Balance'",
         "section": "'Opening Cash and Bank Balance'",
         "currency": company_currency,
     })
-    data.append(opening_row)
-    data.append({})
+    yield opening_row
+    yield {}
 
     # --------------------------------
     # Closing Cash and Bank Balance
     # --------------------------------
+    closing_values = [
+        flt(opening_row.get(key)) + net_change for key, net_change in zip(period_keys, net_cash_values, strict=True)
+    ]
     closing_row = {
-    "section_name": "'Closing Cash and Bank Balance'",
-    "section": "'Closing Cash and Bank Balance'",
-    "currency": company_currency,
+        "section_name": "'Closing Cash and Bank Balance'",
+        "section": "'Closing Cash and Bank Balance'",
+        "currency": company_currency,
+        **dict(zip(period_keys, closing_values, strict=True)),
+        "total": get_period_total(closing_values, balance_type="closing"),
     }
 
-    total = 0
+    yield closing_row
+    yield {}
 
-    for period in period_list:
-        key = period["key"]
 
-        opening = opening_row.get(key, 0)
-        net_change = net_cash_row.get(key, 0)
+def execute_split(filters):
+    """
+    Cash flow with one column group per cost center or project (`split_by`).
+    Every group runs the rows of `get_cash_flow_accounts` over a view of the one
+    ledger scan, grouped by that dimension: the ledger is read once, however
+    many groups there are.
+    """
+    validate_split_filters(filters)
 
-        value = opening + net_change
-        closing_row[key] = value
-        total += value
+    start_trace(filters)
+    profile = start_profile(filters)
 
-    closing_row["total"] = total
+    period_list = get_report_period_list(filters)
 
-    data.append(closing_row)
-    data.append({})
+    results = []
+    for split_filters in get_split_filters(filters, period_list):
+        summary_data = {}
+        data = list(iter_cash_flow_data(split_filters, period_list, summary_data))
+        results.append((split_filters.split_label, data, summary_data))
 
-    
-    columns = get_columns(
-        filters.periodicity,
-        period_list,
-        filters.accumulated_values,
-        filters.company,
-        True,
+    with profile.stage("get_columns"):
+        report_columns = get_report_columns(filters, period_list)
+
+    company_currency = frappe.get_cached_value("Company", filters.company, "default_currency")
+    columns, data, report_summary = merge_split_results(
+        report_columns,
+        [
+            (label, data, get_report_summary(summary_data, company_currency))
+            for label, data, summary_data in results
+        ],
     )
 
+    with profile.stage("get_chart_data"):
+        chart = get_chart_data(get_split_chart_columns(report_columns, results), data, company_currency)
+
+    get_trace().flush()
+    profile.log(filters)
+
+    message = profile.as_html() if cint(filters.get("debug_profile")) else None
+
+    return columns, data, message, chart, report_summary
+
+
+def execute_multi_year(filters):
+    """
+    Cash flow over several fiscal years. Every fiscal year is computed as an
+    independent single-year report, concurrently, and the results are merged
+    into one set of period columns.
+    """
+    year_filters = get_fiscal_year_filters(filters)
+    results = run_in_parallel(execute, [(dict(year),) for year in year_filters])
+
+    columns, data, report_summary = merge_fiscal_year_results(results)
+
+    company_currency = frappe.get_cached_value("Company", filters.company, "default_currency")
     chart = get_chart_data(columns, data, company_currency)
 
-    report_summary = get_report_summary(summary_data, company_currency)
+    return columns, data, None, chart, report_summary
+
+
+def execute_consolidated(filters, companies):
+    """
+    Cash flow of a group of companies. Every company is computed as an
+    independent report, concurrently, and the results are converted to the
+    presentation currency and merged section by section.
+    """
+    company_filters = get_company_filters(filters, companies)
+    results = run_in_parallel(execute, [(dict(company_filter),) for company_filter in company_filters])
+
+    currency = get_presentation_currency(filters, companies)
+    period_list = get_period_list(
+        filters.from_fiscal_year,
+        filters.to_fiscal_year,
+        filters.period_start_date,
+        filters.period_end_date,
+        filters.filter_based_on,
+        filters.periodicity,
+        company=filters.company or companies[0],
+    )
+    rates = [
+        get_exchange_rates(company, currency, period_list, filters.period_end_date) for company in companies
+    ]
+
+    columns, data, report_summary = merge_company_results(
+        results, rates, currency, cint(filters.accumulated_values)
+    )
+    chart = get_chart_data(columns, data, currency)
 
     return columns, data, None, chart, report_summary
 
 
+def get_cash_flow_row_data(row, period_list, filters, account_type_gl_data):
+    """Period values of a row declared in `get_cash_flow_accounts`, from its source in ROW_SOURCES."""
+    return ROW_SOURCES[row["source"]]["method"](row, period_list, filters, account_type_gl_data)
+
+
+def get_fetch_plan(cash_flow_sections):
+    """
+    What the declared rows need fetched before any of them is computed: the
+    account types read from the GL, aggregated in one pass over the ledger scan.
+
+    The period ledger and the P&L are not part of the plan: the opening and
+    closing cash rows and the net profit row read them on every report.
+    """
+    plan = frappe._dict(gl_account_types=[])
+
+    for section in cash_flow_sections:
+        for row in section["account_types"]:
+            if ROW_SOURCES[row["source"]]["fetch"] == "gl":
+                plan.gl_account_types.append(row["account_type"])
+
+    plan.gl_account_types = sorted(set(plan.gl_account_types))
+    return plan
+
+
 def get_cash_flow_accounts():
+    """
+    Cash flow sections and their rows. Every row declares its data `source`
+    (see ROW_SOURCES) with the source's parameters and the totals it is part
+    of; only account type rows carry an `account_type`.
+    """
     operation_accounts = {
         "section_name": "Operations",
         "section_footer": _("Net Cash from Operating Activities"),
         "section_header": _("Cash Flow from Operating Act"),
         "account_types": [
-            {"account_type": "Depreciation", "label": _("Depreciation & Amortisation")},
-            {"account_type": "Depreciation", "label": _("Interest Expense")},
-            # {"account_type": "Depreciation", "label": _("Operating Profit before Working Capital Changes")},
-            {"account_type": "Receivable", "label": _("Change in Trade Receivables")},
-            {"account_type": "Stock", "label": _("Change in Inventory")},
-            {"account_type": "Payable", "label": _("Change in Trade Payables")},
-
-            {"account_type": "Other", "label": _("Loans and Advances (Assets)")},
-            {"account_type": "Other", "label": _("Prepayment")},
-            {"account_type": "Other", "label": _("Tax Assets")},
-            {"account_type": "Other", "label": _("Investment")},
-            {"account_type": "Other", "label": _("Withholding Tax")},
+            {
+                "account_type": "Depreciation",
+                "label": _("Depreciation & Amortisation"),
+                "source": "account_type",
+                "include_in_op_profit": True,
+            },
+            {
+                "label": _("Interest Expense"),
+                "source": "profit_and_loss",
+                "pl_labels": ("FINANCE COST", "INTEREST"),
+                "include_in_op_profit": True,
+            },
+            {
+                "label": _("Change in Trade Receivables"),
+                "source": "working_capital",
+                "tb_label": "Accounts Receivable",
+                "include_in_op_total": True,
+            },
+            {
+                "label": _("Change in Inventory"),
+                "source": "working_capital",
+                "tb_label": "INVENTORY",
+                "include_in_op_total": True,
+            },
+            {
+                "label": _("Change in Trade Payables"),
+                "source": "working_capital",
+                "tb_label": "Accounts Payable",
+                "include_in_op_total": True,
+            },
+            {
+                "label": _("Loans and Advances (Assets)"),
+                "source": "balance_change",
+                "tb_labels": ("Loans and Advances (Assets)",),
+                "include_in_op_total": True,
+            },
+            {
+                "label": _("Prepayment"),
+                "source": "balance_change",
+                "tb_labels": ("PREPAYMENT",),
+                "include_in_op_total": True,
+            },
+            {
+                "label": _("Tax Assets"),
+                "source": "balance_change",
+                "tb_labels": ("Tax Assets",),
+                "include_in_op_total": True,
+            },
+            {
+                "label": _("Investment"),
+                "source": "balance_change",
+                "tb_labels": ("Investment",),
+                "include_in_op_total": True,
+            },
+            {
+                "label": _("Withholding Tax"),
+                "source": "balance_change",
+                "tb_labels": ("WITHHOLDING TAX 7.5%", "WITHHOLDING TAX 3%"),
+                "include_in_op_total": True,
+            },
         ],
     }
 
@@ -579,10 +613,17 @@ def get_cash_flow_accounts():
         "section_footer": _("Net Cash used Investing Activities"),
         "section_header": _("Cash Flows From Investing Activities"),
         "account_types": [
-            {"account_type": "Fixed Asset", "label": _("Purchase of PPE")},
-            {"account_type": "Fixed Asset", "label": _("Proceeds from Asset Disposal")},
-            
-   ],
+            {
+                "label": _("Purchase of PPE"),
+                "source": "ppe_movement",
+                "movement_type": "purchase",
+            },
+            {
+                "label": _("Proceeds from Asset Disposal"),
+                "source": "ppe_movement",
+                "movement_type": "disposal",
+            },
+        ],
     }
 
     financing_accounts = {
@@ -590,82 +631,76 @@ def get_cash_flow_accounts():
         "section_footer": _("Net Cash from Financing Activities"),
         "section_header": _("Cash Flow from Financing Activities"),
         "account_types": [
-              {"account_type": "Equity", "label": _("Interest Paid")},
-            {"account_type": "Equity", "label": _("Borrowings/Equity Movements")},
-         ],
+            {
+                "label": _("Interest Paid"),
+                "source": "profit_and_loss",
+                "pl_labels": ("FINANCE COST", "INTEREST"),
+                "include_in_net_cash": True,
+            },
+            {
+                "label": _("Borrowings/Equity Movements"),
+                "source": "constant",
+                "value": 0,
+                "include_in_net_cash": True,
+            },
+        ],
     }
 
     # combine all cash flow accounts for iteration
     return [operation_accounts, investing_accounts, financing_accounts]
 
 
-def get_account_type_based_data(company, account_type, period_list, accumulated_values, filters):
-    data = {}
-    total = 0
+def get_account_type_based_data(account_type, period_list, gl_data, accumulated_values):
+    """
+    Per-period GL balance of `account_type`, read from `gl_data`, the result of
+    `get_account_type_based_gl_data_from_scan`.
+    """
+    values = []
     for period in period_list:
-        start_date = get_start_date(period, accumulated_values, company)
-        filters.start_date = start_date
-        filters.end_date = period["to_date"]
-        filters.account_type = account_type
-
-        amount = get_account_type_based_gl_data(company, filters)
-
+        amount = gl_data.get(account_type, {}).get(period["key"], 0)
         if amount and account_type == "Depreciation":
             amount *= -1
 
-        total += amount
-        data.setdefault(period["key"], amount)
-
-    data["total"] = total
-    return data
+        values.append(amount)
 
+    return get_period_values_row(period_list, values, accumulated_values)
 
-def get_account_type_based_gl_data(company, filters=None):
-    cond = ""
-    filters = frappe._dict(filters or {})
 
-    if filters.include_default_book_entries:
-        company_fb = frappe.get_cached_value("Company", company, "default_finance_book")
-        cond = """ AND (finance_book in ({}, {}, '') OR finance_book IS NULL)
-            """.format(
-            frappe.db.escape(filters.finance_book),
-            frappe.db.escape(company_fb),
-        )
-    else:
-        cond = " AND (finance_book in (%s, '') OR finance_book IS NULL)" % (
-            frappe.db.escape(cstr(filters.finance_book))
-        )
+def get_account_type_based_gl_data_from_scan(account_types, period_list, accumulated_values, filters):
+    """
+    `sum(credit) - sum(debit)` for every account type and period, aggregated
+    from the report's ledger scan over the leaf accounts of each type.
 
-    if filters.get("cost_center"):
-        filters.cost_center = get_cost_centers_with_children(filters.cost_center)
-        cond += " and cost_center in %(cost_center)s"
-
-    gl_sum = frappe.db.sql_list(
-        f"""
-        select sum(credit) - sum(debit)
-        from `tabGL Entry`
-        where company=%(company)s and posting_date >= %(start_date)s and posting_date <= %(end_date)s
-            and voucher_type != 'Period Closing Voucher'
-            and account in ( SELECT name FROM tabAccount WHERE account_type = %(account_type)s) {cond}
-    """,
-        filters,
-    )
+    Returns {account_type: {period_key: amount}}.
+    """
+    account_types = {d for d in account_types if d}
+    if not account_types or not period_list:
+        return {}
 
-    return gl_sum[0] if gl_sum and gl_sum[0] else 0
+    scan = get_ledger_scan(period_list, filters)
+    balances = scan.get_balances()
 
+    gl_data = {}
+    for account in scan.accounts:
+        if account.is_group or account.account_type not in account_types:
+            continue
 
-def get_start_date(period, accumulated_values, company):
-    if not accumulated_values and period.get("from_date"):
-        return period["from_date"]
+        account_balances = balances.get(account.name)
+        if not account_balances:
+            continue
 
-    start_date = period["year_start_date"]
-    if accumulated_values:
-        start_date = get_fiscal_year(period.to_date, company=company)[1]
+        type_data = gl_data.setdefault(account.account_type, {period["key"]: 0.0 for period in period_list})
+        for idx, period in enumerate(period_list):
+            if accumulated_values:
+                type_data[period["key"]] -= account_balances.year_to_date(idx)
+            else:
+                type_data[period["key"]] -= account_balances.movement(idx, idx)
 
-    return start_date
+    return gl_data
 
 
-def add_total_row_account(out, data, label, period_list, currency, summary_data, filters, consolidated=False):
+def add_total_row_account(out, grid, role, label, period_list, currency, summary_data, filters):
+    """Append the total of the `grid` rows of `role` (and a blank row) to `out`."""
     total_row = {
         "section_name": "'" + _("{0}").format(label) + "'",
         "section": "'" + _("{0}").format(label) + "'",
@@ -673,28 +708,14 @@ def add_total_row_account(out, data, label, period_list, currency, summary_data,
         "is_section_total": True,
     }
 
-    summary_data[label] = 0
-
     # from consolidated financial statement
     if filters.get("accumulated_in_group_company"):
         period_list = get_filtered_list_for_consolidated_report(filters, period_list)
 
-    for row in data:
-        if label == _("Net Cash from Operating Activities"):
-            if not row.get("include_in_op_total"):
-                continue
-        else:
-            if not row.get("parent_section"):
-                continue
-        if row.get("parent_section"):
-            for period in period_list:
-                key = period if consolidated else period["key"]
-                total_row.setdefault(key, 0.0)
-                total_row[key] += row.get(key, 0.0)
-                summary_data[label] += row.get(key)
-
-            total_row.setdefault("total", 0.0)
-            total_row["total"] += row["total"]
+    keys = [period["key"] for period in period_list]
+    total_row.update(grid.as_row(grid.sum(role), keys))
+    total_row["total"] = get_period_total([total_row[key] for key in keys], filters.accumulated_values)
+    summary_data[label] = total_row["total"]
 
     out.append(total_row)
     out.append({})
@@ -702,135 +723,6 @@ def add_total_row_account(out, data, label, period_list, currency, summary_data,
     return total_row
 
 
-def show_opening_and_closing_balance(out, period_list, currency, net_change_in_cash, filters):
-    opening_balance = {
-        "section_name": "Opening",
-        "section": "Opening",
-        "currency": currency,
-    }
-    closing_balance = {
-        "section_name": "Closing (Opening + Total)",
-        "section": "Closing (Opening + Total)",
-        "currency": currency,
-    }
-
-    opening_amount = get_opening_balance(filters.company, period_list, filters) or 0.0
-    running_total = opening_amount
-
-    for i, period in enumerate(period_list):
-        key = period["key"]
-        change = net_change_in_cash.get(key, 0.0)
-
-        opening_balance[key] = opening_amount if i == 0 else running_total
-        running_total += change
-        closing_balance[key] = running_total
-
-    opening_balance["total"] = opening_balance[period_list[0]["key"]]
-    closing_balance["total"] = closing_balance[period_list[-1]["key"]]
-
-    out.extend([opening_balance, net_change_in_cash, closing_balance, {}])
-
-
-def get_opening_balance(company, period_list, filters):
-    from copy import deepcopy
-
-    cash_value = {}
-    account_types = get_cash_flow_accounts()
-    net_profit_loss = 0.0
-
-    local_filters = deepcopy(filters)
-    local_filters.start_date, local_filters.end_date = get_opening_range_using_fiscal_year(
-        company, period_list
-    )
-
-    for section in account_types:
-        section_name = section.get("section_name")
-        cash_value.setdefault(section_name, 0.0)
-
-        if section_name == "Operations":
-            net_profit_loss += get_net_income(company, period_list, local_filters)
-
-        for account in section.get("account_types", []):
-            account_type = account.get("account_type")
-            local_filters.account_type = account_type
-
-            amount = get_account_type_based_gl_data(company, local_filters) or 0.0
-
-            if account_type == "Depreciation":
-                cash_value[section_name] += amount * -1
-            else:
-                cash_value[section_name] += amount
-
-    return sum(cash_value.values()) + net_profit_loss
-
-
-def get_net_income(company, period_list, filters):
-    gl_entries_by_account_for_income, gl_entries_by_account_for_expense = {}, {}
-    income, expense = 0.0, 0.0
-    from_date, to_date = get_opening_range_using_fiscal_year(company, period_list)
-
-    for root_type in ["Income", "Expense"]:
-        for root in frappe.db.sql(
-            """select lft, rgt from tabAccount
-                where root_type=%s and ifnull(parent_account, '') = ''""",
-            root_type,
-            as_dict=1,
-        ):
-            set_gl_entries_by_account(
-                company,
-                from_date,
-                to_date,
-                filters,
-                gl_entries_by_account_for_income
-                if root_type == "Income"
-                else gl_entries_by_account_for_expense,
-                root.lft,
-                root.rgt,
-                root_type=root_type,
-                ignore_closing_entries=True,
-            )
-
-    for entries in gl_entries_by_account_for_income.values():
-        for entry in entries:
-            if entry.posting_date <= to_date:
-                amount = (entry.debit - entry.credit) * -1
-                income = flt((income + amount), 2)
-
-    for entries in gl_entries_by_account_for_expense.values():
-        for entry in entries:
-            if entry.posting_date <= to_date:
-                amount = entry.debit - entry.credit
-                expense = flt((expense + amount), 2)
-
-    return income - expense
-
-
-def get_opening_range_using_fiscal_year(company, period_list):
-    first_from_date = period_list[0]["from_date"]
-    previous_day = first_from_date - timedelta(days=1)
-
-    # Get the earliest fiscal year for the company
-
-    FiscalYear = DocType("Fiscal Year")
-    FiscalYearCompany = DocType("Fiscal Year Company")
-
-    earliest_fy = (
-        frappe.qb.from_(FiscalYear)
-        .join(FiscalYearCompany)
-        .on(FiscalYearCompany.parent == FiscalYear.name)
-        .select(FiscalYear.year_start_date)
-        .where(FiscalYearCompany.company == company)
-        .orderby(FiscalYear.year_start_date, order=Order.asc)
-        .limit(1)
-    ).run(as_dict=True)
-
-    if not earliest_fy:
-        frappe.throw(_("Not able to find the earliest Fiscal Year for the given company."))
-
-    company_start_date = earliest_fy[0]["year_start_date"]
-    return company_start_date, previous_day
-
-
 def get_report_summary(summary_data, currency):
     report_summary = []
 
@@ -842,7 +734,6 @@ def get_report_summary(summary_data, currency):
 
 def get_chart_data(columns, data, currency):
     labels = [d.get("label") for d in columns[2:]]
-    print(data)
     datasets = [
         {
             "name": section.get("section").replace("'", ""),
@@ -862,103 +753,55 @@ def get_chart_data(columns, data, currency):
     return chart
 
 
-def get_interest_expense_from_pl(period_list, filters):
-    pl_filters = {
-        "company": filters.company,
-        "filter_based_on": "Fiscal Year",
-        "period_start_date": filters.period_start_date,
-        "period_end_date": filters.period_end_date,
-        "from_fiscal_year": filters.from_fiscal_year,
-        "to_fiscal_year": filters.to_fiscal_year,
-        "periodicity": filters.periodicity,
-        "cost_center": filters.cost_center or [],
-        "project": filters.project or [],
-        "include_default_book_entries": 1,
-        "accumulated_values": 1
-    }
+def get_interest_expense_from_pl(period_list, filters, labels=("FINANCE COST", "INTEREST")):
+    """Sum of the P&L rows matching the `labels` patterns, per period as in the P&L snapshot."""
+    pl_snapshot = get_pl_snapshot(period_list, filters)
 
-    pl_result = get_profit_and_loss_report(pl_filters)
+    values = [0.0] * len(period_list)
+    for row in pl_snapshot.get_matching_rows(*labels):
+        values = [value + flt(row.get(period["key"])) for value, period in zip(values, period_list, strict=True)]
 
-    rows = pl_result.get("result", [])
+    return get_period_values_row(period_list, values, filters.accumulated_values)
 
-    interest_data = {}
-    total = 0
 
-    for period in period_list:
-        interest_data[period["key"]] = 0
-
-    for row in rows:
-        parent = (row.get("parent_account") or "").upper()
-        name = (row.get("account_name") or "").upper()
+def get_clamped_balance(balance, filters):
+    """
+    `balance` floored at zero. The column groups of a split report keep the
+    signed balance: a group's balance goes negative when the counter entry is
+    in another group, and flooring each group would keep the groups from adding
+    up to the unsplit report.
+    """
+    if filters.get("split_values"):
+        return balance
 
-        if "FINANCE COST" in parent and "INTEREST" in name:
-            for period in period_list:
-                key = period["key"]
-                value = row.get(key, 0) or 0
-                interest_data[key] += value
-                total += value
+    return max(balance, 0)
 
-    interest_data["total"] = total
-    return interest_data
 
 def get_working_capital_change_from_tb(account_name, period_list, filters):
+    balances = get_period_ledger(period_list, filters).get_balances(account_name)
 
-    tb_filters = {
-        "company": filters.company,
-        "from_date": filters.period_start_date,
-        "to_date": filters.period_end_date,
-        "fiscal_year": filters.from_fiscal_year,
-        "cost_center": filters.cost_center or [],
-        "project": filters.project or [],
-        "include_default_book_entries": 1,
-        "show_net_values": 1,
-        "with_period_closing_entry_for_opening": 1,
-        "with_period_closing_entry_for_current_period": 1,
-    }
-
-    tb_filters.update({
-        "filter_based_on": filters.filter_based_on,
-        "from_fiscal_year": filters.get("from_fiscal_year"),
-        "to_fiscal_year": filters.get("to_fiscal_year"),
-        "period_start_date": filters.get("period_start_date"),
-        "period_end_date": filters.get("period_end_date"),
-    })
-
-    tb_result = get_trial_balance_report(tb_filters)
-    rows = tb_result.get("result", [])
+    if not balances:
+        return get_period_values_row(period_list, None)
 
-    data = {}
-    total = 0
-
-    for period in period_list:
-        data[period["key"]] = 0
-
-    for row in rows:
-        if row.get("account_name") != account_name:
-            continue
-
-        opening = 0
-        closing = 0
+    values = []
+    for first, last in get_period_bounds(period_list, filters.accumulated_values):
+        opening = balances.opening_balance(first)
+        closing = balances.closing_balance(last)
 
         # ASSETS → debit
         if account_name in ["Accounts Receivable", "INVENTORY"]:
-            opening = row.get("opening_debit", 0)
-            closing = row.get("closing_debit", 0)
-            value = opening - closing
+            value = get_clamped_balance(opening, filters) - get_clamped_balance(closing, filters)
 
         # # LIABILITIES → credit
         elif account_name == "Accounts Payable":
-            opening = row.get("opening_credit", 0)
-            closing = row.get("closing_credit", 0)
-            value = (opening - closing) * -1
+            value = (get_clamped_balance(-opening, filters) - get_clamped_balance(-closing, filters)) * -1
 
-        for period in period_list:
-            key = period["key"]
-            data[key] = value
-            total += value
+        else:
+            value = opening - closing
 
-    data["total"] = total
-    return data
+        values.append(value)
+
+    return get_period_values_row(period_list, values, filters.accumulated_values)
 
 
 def validate_and_prepare_filters(filters):
@@ -972,13 +815,11 @@ def validate_and_prepare_filters(filters):
         if not filters.from_fiscal_year or not filters.to_fiscal_year:
             frappe.throw(_("Please select From Fiscal Year and To Fiscal Year"))
 
-        if filters.from_fiscal_year != filters.to_fiscal_year:
-            frappe.throw(_("From Fiscal Year and To Fiscal Year must be the same"))
+        fy_start = frappe.get_cached_value("Fiscal Year", filters.from_fiscal_year, "year_start_date")
+        fy_end = frappe.get_cached_value("Fiscal Year", filters.to_fiscal_year, "year_end_date")
 
-        fy_name, fy_start, fy_end = get_fiscal_year(
-            filters.from_fiscal_year,
-            company=filters.company
-        )
+        if getdate(fy_start) > getdate(fy_end):
+            frappe.throw(_("From Fiscal Year cannot be after To Fiscal Year"))
 
         filters.period_start_date = fy_start
         filters.period_end_date = fy_end
@@ -1003,14 +844,9 @@ def validate_and_prepare_filters(filters):
             company=filters.company
         )
 
-        if fy1_name != fy2_name:
-            frappe.throw(
-                _("Start Date and End Date must belong to the same Fiscal Year")
-            )
-
         # Auto-assign fiscal year
         filters.from_fiscal_year = fy1_name
-        filters.to_fiscal_year = fy1_name
+        filters.to_fiscal_year = fy2_name
 
     else:
         frappe.throw(_("Invalid Filter Based On selection"))
@@ -1019,115 +855,139 @@ def validate_and_prepare_filters(filters):
 def get_cash_and_bank_balance(period_list, filters, balance_type):
     """
     balance_type: 'opening' or 'closing'
-    """    
-    tb_filters = {
-        "company": filters.company,
-        "from_date": filters.period_start_date,
-        "to_date": filters.period_end_date,
-        "fiscal_year": filters.from_fiscal_year,
-        "cost_center": filters.cost_center or [],
-        "project": filters.project or [],
-        "include_default_book_entries": 1,
-        "show_net_values": 1,
-        "with_period_closing_entry_for_opening": 1,
-        "with_period_closing_entry_for_current_period": 1,
-    }
-
-    tb_filters.update({
-        "filter_based_on": filters.filter_based_on,
-        "from_fiscal_year": filters.get("from_fiscal_year"),
-        "to_fiscal_year": filters.get("to_fiscal_year"),
-        "period_start_date": filters.get("period_start_date"),
-        "period_end_date": filters.get("period_end_date"),
-    })
-    tb_result = get_trial_balance_report(tb_filters)
-    rows = tb_result.get("result", [])
-
-    data = {}
-    total = 0
-
-    for period in period_list:
-        data[period["key"]] = 0
+    """
+    ledger = get_period_ledger(period_list, filters)
+    values = [0.0] * len(period_list)
 
-    for row in rows:
-        if row.get("account_name") not in ("Bank Accounts", "Cash In Hand"):
+    for label in ("Bank Accounts", "Cash In Hand"):
+        balances = ledger.get_balances(label)
+        if not balances:
             continue
 
-        if balance_type == "opening":
-            value = row.get("opening_debit", 0)
+        for idx, (first, last) in enumerate(get_period_bounds(period_list, filters.accumulated_values)):
+            if balance_type == "opening":
+                values[idx] += get_clamped_balance(balances.opening_balance(first), filters)
 
-        else:
-            value = row.get("closing_credit", 0)
+            else:
+                values[idx] += get_clamped_balance(-balances.closing_balance(last), filters)
 
-        for period in period_list:
-            data[period["key"]] += value
-            total += value
-            
-    data["total"] = total
-    return data
+    return get_period_values_row(period_list, values, balance_type=balance_type)
 
 
-def get_ppe_movement_from_tb(period_list, filters, movement_type):
+def get_row_accounts(row, accounts):
     """
-    movement_type:
-        - 'purchase'  → debit based
-        - 'disposal'  → credit based
+    Names of the accounts whose GL entries make up a row declared in
+    `get_cash_flow_accounts`, resolved from the company's `accounts` the way the
+    row's source resolves them.
     """
+    return ROW_SOURCES[row["source"]]["accounts"](row, accounts)
 
-    tb_filters = {
-        "company": filters.company,
-        "from_date": filters.period_start_date,
-        "to_date": filters.period_end_date,
-        "fiscal_year": filters.from_fiscal_year,
-        "cost_center": filters.cost_center or [],
-        "project": filters.project or [],
-        "include_default_book_entries": 1,
-        "show_net_values": 0,
-        "with_period_closing_entry_for_opening": 1,
-        "with_period_closing_entry_for_current_period": 1,
-    }
 
-    tb_filters.update({
-        "filter_based_on": filters.filter_based_on,
-        "from_fiscal_year": filters.from_fiscal_year,
-        "to_fiscal_year": filters.to_fiscal_year,
-        "period_start_date": filters.period_start_date,
-        "period_end_date": filters.period_end_date,
-    })
+def get_labelled_accounts(accounts, labels):
+    """Balance sheet accounts matching `labels` (as in the PeriodLedger), with their subtrees."""
+    balance_sheet = [account for account in accounts if account.report_type == "Balance Sheet"]
+    index = AccountIndex(balance_sheet)
 
-    tb_result = get_trial_balance_report(tb_filters)
-    rows = tb_result.get("result", [])
+    names = []
+    for label in labels:
+        account = index.find(label)
+        if account:
+            names.extend(get_account_subtree(balance_sheet, account))
 
-    data = {p["key"]: 0 for p in period_list}
-    total = 0
+    return names
 
-    ppe_row = None
-    dep_row = None
 
-    for row in rows:
-        if row.get("account_name") == "PROPERTY, PLANT & EQUIPMENT AIRPORT":
-            ppe_row = row
-        elif row.get("account_name") == "ACCUMULATED DEPRECIATION":
-            dep_row = row
+def get_pl_accounts(accounts, labels):
+    """Income and expense accounts matching the `labels` patterns, with their subtrees."""
+    pl_accounts = [account for account in accounts if account.root_type in ("Income", "Expense")]
+    return [
+        name
+        for account in match_accounts(pl_accounts, *labels)
+        for name in get_account_subtree(pl_accounts, account)
+    ]
 
-    if not ppe_row:
-        return {"total": 0, **data}
 
-    for period in period_list:
-        key = period["key"]
+def get_ppe_movement_from_tb(period_list, filters, movement_type):
+    """
+    movement_type:
+        - 'purchase'  → debit based
+        - 'disposal'  → credit based
+    """
+    ledger = get_period_ledger(period_list, filters)
+
+    ppe = ledger.get_balances(PPE_LABEL)
+    dep = ledger.get_balances(ACCUMULATED_DEPRECIATION_LABEL)
+
+    if not ppe:
+        return get_period_values_row(period_list, None)
 
+    values = []
+    for first, last in get_period_bounds(period_list, filters.accumulated_values):
         if movement_type == "purchase":
-            ppe_value = ppe_row.get("debit", 0)
-            dep_value = dep_row.get("debit", 0) if dep_row else 0
+            ppe_value = sum(ppe.debit[first : last + 1])
+            dep_value = sum(dep.debit[first : last + 1]) if dep else 0
             value = -abs(ppe_value - dep_value)
 
         else:  # disposal
-            ppe_value = ppe_row.get("credit", 0)
-            dep_value = dep_row.get("credit", 0) if dep_row else 0
+            ppe_value = sum(ppe.credit[first : last + 1])
+            dep_value = sum(dep.credit[first : last + 1]) if dep else 0
             value = ppe_value - dep_value
 
-        data[key] = value
-        total += value
+        values.append(value)
 
-    data["total"] = total
-    return data
+    return get_period_values_row(period_list, values, filters.accumulated_values)
+
+
+# data sources of the rows declared in get_cash_flow_accounts: the method computing a
+# row's period values, whether it reads the account type totals of the fetch plan
+# (`fetch`: "gl") and the accounts it aggregates, for the drill-down.
+ROW_SOURCES = {
+    "account_type": {
+        "method": lambda row, period_list, filters, gl_data: get_account_type_based_data(
+            row["account_type"], period_list, gl_data, filters.accumulated_values
+        ),
+        "fetch": "gl",
+        "accounts": lambda row, accounts: [
+            account.name for account in accounts if account.account_type == row["account_type"] and not account.is_group
+        ],
+    },
+    "balance_change": {
+        "method": lambda row, period_list, filters, gl_data: get_period_values_row(
+            period_list,
+            get_tb_diff_by_labels(row["tb_labels"], period_list, filters),
+            filters.accumulated_values,
+        ),
+        "fetch": None,
+        "accounts": lambda row, accounts: get_labelled_accounts(accounts, row["tb_labels"]),
+    },
+    "working_capital": {
+        "method": lambda row, period_list, filters, gl_data: get_working_capital_change_from_tb(
+            row["tb_label"], period_list, filters
+        ),
+        "fetch": None,
+        "accounts": lambda row, accounts: get_labelled_accounts(accounts, (row["tb_label"],)),
+    },
+    "ppe_movement": {
+        "method": lambda row, period_list, filters, gl_data: get_ppe_movement_from_tb(
+            period_list, filters, row["movement_type"]
+        ),
+        "fetch": None,
+        "accounts": lambda row, accounts: get_labelled_accounts(
+            accounts, (PPE_LABEL, ACCUMULATED_DEPRECIATION_LABEL)
+        ),
+    },
+    "profit_and_loss": {
+        "method": lambda row, period_list, filters, gl_data: get_interest_expense_from_pl(
+            period_list, filters, row["pl_labels"]
+        ),
+        "fetch": None,
+        "accounts": lambda row, accounts: get_pl_accounts(accounts, row["pl_labels"]),
+    },
+    "constant": {
+        "method": lambda row, period_list, filters, gl_data: get_period_values_row(
+            period_list, [row.get("value", 0)] * len(period_list), filters.accumulated_values
+        ),
+        "fetch": None,
+        "accounts": lambda row, accounts: [],
+    },
+}
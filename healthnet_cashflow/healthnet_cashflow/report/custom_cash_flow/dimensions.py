@@ -0,0 +1,123 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import cint, cstr
+
+from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import get_accounting_dimensions
+
+
+class DimensionContext:
+    """
+    Finance book, cost center, project and accounting dimension filters of a
+    report, resolved once: cost centers and tree dimensions are expanded to
+    their subtree (by lft / rgt), every other filter to its set of values.
+    """
+
+    def __init__(self, filters):
+        self.company = filters.company
+        self.finance_book = cstr(filters.finance_book)
+        self.include_default_book_entries = cint(filters.include_default_book_entries)
+        self.default_finance_book = (
+            cstr(frappe.get_cached_value("Company", filters.company, "default_finance_book"))
+            if self.include_default_book_entries
+            else ""
+        )
+
+        self.cost_centers = get_subtree("Cost Center", get_filter_values(filters.get("cost_center")))
+        self.projects = sorted(get_filter_values(filters.get("project")))
+
+        self.dimensions = {}
+        for dimension in get_accounting_dimensions(as_list=False):
+            values = get_filter_values(filters.get(dimension.fieldname))
+            if not values:
+                continue
+
+            if frappe.get_meta(dimension.document_type).is_tree:
+                values = get_subtree(dimension.document_type, values)
+            self.dimensions[dimension.fieldname] = sorted(values)
+
+    @property
+    def key(self):
+        return (
+            self.company,
+            self.finance_book,
+            self.default_finance_book,
+            tuple(self.cost_centers),
+            tuple(self.projects),
+            tuple((fieldname, tuple(values)) for fieldname, values in sorted(self.dimensions.items())),
+        )
+
+    @property
+    def requires_gl_entry(self):
+        """Accounting dimensions are only on GL Entry, not on the period balance table."""
+        return bool(self.dimensions)
+
+    def get_conditions(self, alias=None):
+        """`(condition, values)` restricting a ledger query to the resolved filters."""
+        prefix = f"{alias}." if alias else ""
+        values = {"finance_books": list({self.finance_book, self.default_finance_book, ""})}
+        cond = f" and ({prefix}finance_book in %(finance_books)s or {prefix}finance_book is null)"
+
+        if self.cost_centers:
+            values["cost_center"] = self.cost_centers
+            cond += f" and {prefix}cost_center in %(cost_center)s"
+
+        if self.projects:
+            values["project"] = self.projects
+            cond += f" and {prefix}project in %(project)s"
+
+        for fieldname, dimension_values in self.dimensions.items():
+            values[f"dimension_{fieldname}"] = dimension_values
+            cond += f" and {prefix}`{fieldname}` in %(dimension_{fieldname})s"
+
+        return cond, values
+
+
+def get_dimension_context(filters):
+    """DimensionContext of `filters`, resolved once per request."""
+    key = (
+        filters.company,
+        cstr(filters.finance_book),
+        cint(filters.include_default_book_entries),
+        frappe.as_json(
+            {
+                fieldname: sorted(get_filter_values(filters.get(fieldname)))
+                for fieldname in ("cost_center", "project", *get_accounting_dimensions())
+            }
+        ),
+    )
+
+    contexts = frappe.local.request_cache["cash_flow_dimension_context"]
+    if key not in contexts:
+        contexts[key] = DimensionContext(filters)
+
+    return contexts[key]
+
+
+def get_filter_values(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = frappe.parse_json(value) if value.startswith("[") else value.split(",")
+
+    return [cstr(v).strip() for v in value if cstr(v).strip()]
+
+
+def get_subtree(doctype, names):
+    """`names` and all their descendants in the `doctype` tree."""
+    if not names:
+        return []
+
+    table = f"`tab{doctype}`"
+    descendants = frappe.db.sql_list(
+        f"""
+        select distinct child.name
+        from {table} child
+        inner join {table} parent on child.lft >= parent.lft and child.rgt <= parent.rgt
+        where parent.name in %(names)s
+    """,
+        {"names": names},
+    )
+
+    return sorted(set(names) | set(descendants))
@@ -0,0 +1,163 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.utils import cint, cstr
+
+from erpnext.accounts.utils import get_fiscal_year
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.consolidated import (
+    get_consolidated_companies,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.custom_cash_flow import (
+    get_cash_flow_accounts,
+    get_report_period_list,
+    get_row_accounts,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.dimensions import get_dimension_context
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.ledger_scan import get_company_accounts
+
+NET_PROFIT_SECTION = "Net Profit After Tax"
+DEFAULT_PAGE_LENGTH = 100
+MAX_PAGE_LENGTH = 1000
+
+ENTRY_FIELDS = (
+    "name",
+    "posting_date",
+    "account",
+    "voucher_type",
+    "voucher_no",
+    "party_type",
+    "party",
+    "cost_center",
+    "project",
+    "finance_book",
+    "debit",
+    "credit",
+)
+
+
+def get_row_definition(section):
+    """Row of `get_cash_flow_accounts` labelled `section`, or None."""
+    for cash_flow_section in get_cash_flow_accounts():
+        for row in cash_flow_section["account_types"]:
+            if row["label"] == section:
+                return row
+
+
+def get_cell_accounts(filters, section):
+    """
+    Names of the accounts behind a report row, or None for rows that are not
+    read from accounts (headers, totals, cash balances).
+    """
+    section = cstr(section).strip("'")
+    accounts = get_company_accounts(filters.company)
+
+    if section == NET_PROFIT_SECTION:
+        return [account.name for account in accounts if account.root_type in ("Income", "Expense")]
+
+    row = get_row_definition(section)
+    if not row:
+        return None
+
+    return get_row_accounts(row, accounts)
+
+
+def get_cell_date_range(filters, period_list, row, period_key):
+    """
+    (from_date, to_date) of the entries behind the `period_key` value of a row:
+    the period, or from the first period for accumulated values (from the
+    fiscal year start for account type rows). The total covers all periods.
+    """
+    keys = [period["key"] for period in period_list]
+    accumulated_values = cint(filters.accumulated_values)
+
+    if period_key == "total":
+        first, last = 0, len(period_list) - 1
+    elif period_key in keys:
+        last = keys.index(period_key)
+        first = 0 if accumulated_values else last
+    else:
+        frappe.throw(_("Invalid period {0}").format(period_key))
+
+    from_date = period_list[first]["from_date"]
+    if row and row["source"] == "account_type" and accumulated_values:
+        # account type rows accumulate from the start of the fiscal year
+        from_date = get_fiscal_year(period_list[0]["to_date"], company=filters.company)[1]
+
+    return from_date, period_list[last]["to_date"]
+
+
+def validate_drill_down_filters(filters):
+    if filters.from_fiscal_year != filters.to_fiscal_year:
+        frappe.throw(_("Drill-down is only available within one fiscal year"))
+
+    if filters.get("split_by") or get_consolidated_companies(filters):
+        frappe.throw(_("Drill-down is not available for split or consolidated reports"))
+
+
+def get_cell_entries(filters, section, period_key, cursor=None, page_length=DEFAULT_PAGE_LENGTH):
+    """
+    GL Entries behind one cell of the report, one page at a time.
+
+    Entries are selected with the predicates of the computation: the row's
+    accounts, the cell's date range and the finance book and dimension filters.
+    Pages are ordered by (posting_date, name) and continue after `cursor`, the
+    `next_cursor` of the previous page (keyset pagination).
+
+    Returns {"entries": [...], "next_cursor": {...} or None}.
+    """
+    validate_drill_down_filters(filters)
+
+    accounts = get_cell_accounts(filters, section)
+    if accounts is None:
+        frappe.throw(_("Row {0} cannot be drilled into").format(cstr(section).strip("'")))
+
+    if not accounts:
+        return {"entries": [], "next_cursor": None}
+
+    period_list = get_report_period_list(filters)
+    row = get_row_definition(cstr(section).strip("'"))
+    from_date, to_date = get_cell_date_range(filters, period_list, row, period_key)
+
+    page_length = min(cint(page_length) or DEFAULT_PAGE_LENGTH, MAX_PAGE_LENGTH)
+
+    cond, values = get_dimension_context(filters).get_conditions(alias="gle")
+    values.update(
+        {
+            "company": filters.company,
+            "accounts": accounts,
+            "from_date": from_date,
+            "to_date": to_date,
+            "limit": page_length + 1,
+        }
+    )
+
+    if cursor:
+        cursor = frappe.parse_json(cursor)
+        values.update({"after_date": cursor["posting_date"], "after_name": cursor["name"]})
+        cond += """ and (gle.posting_date > %(after_date)s
+            or (gle.posting_date = %(after_date)s and gle.name > %(after_name)s))"""
+
+    entries = frappe.db.sql(
+        f"""
+        select {", ".join(f"gle.{field}" for field in ENTRY_FIELDS)}
+        from `tabGL Entry` gle
+        where gle.company=%(company)s and gle.is_cancelled=0
+            and gle.voucher_type != 'Period Closing Voucher' and gle.is_opening != 'Yes'
+            and gle.account in %(accounts)s
+            and gle.posting_date between %(from_date)s and %(to_date)s
+            {cond}
+        order by gle.posting_date, gle.name
+        limit %(limit)s
+    """,
+        values,
+        as_dict=True,
+    )
+
+    next_cursor = None
+    if len(entries) > page_length:
+        entries = entries[:page_length]
+        next_cursor = {"posting_date": cstr(entries[-1].posting_date), "name": entries[-1].name}
+
+    return {"entries": entries, "next_cursor": next_cursor}
@@ -0,0 +1,331 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+import frappe
+from frappe.utils import cint, cstr, flt
+
+from erpnext.accounts.utils import get_fiscal_year
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.dimensions import get_dimension_context
+from healthnet_cashflow.utils.period_balance import get_ledger_source
+
+# buckets of the entries before the first period: before the fiscal year of the
+# first period, and from its start up to the first period
+BEFORE_FISCAL_YEAR = -2
+BEFORE_FIRST_PERIOD = -1
+
+# dimensions the scan is grouped by besides account and bucket
+DIMENSIONS = ("finance_book", "cost_center")
+
+
+class AccountBalances:
+    """Opening balance and per-period debit / credit of an account (subtree)."""
+
+    def __init__(self, periods):
+        self.opening = 0.0
+        self.year_opening = 0.0
+        self.debit = [0.0] * periods
+        self.credit = [0.0] * periods
+
+    def add(self, other):
+        self.opening += other.opening
+        self.year_opening += other.year_opening
+        self.debit = [a + b for a, b in zip(self.debit, other.debit, strict=True)]
+        self.credit = [a + b for a, b in zip(self.credit, other.credit, strict=True)]
+
+    def opening_balance(self, idx):
+        """Debit balance at the start of period `idx`."""
+        return self.opening + sum(self.debit[:idx]) - sum(self.credit[:idx])
+
+    def closing_balance(self, idx):
+        """Debit balance at the end of period `idx`."""
+        return self.opening_balance(idx + 1)
+
+    def movement(self, first, last):
+        """Debit - credit over periods `first` to `last`."""
+        return sum(self.debit[first : last + 1]) - sum(self.credit[first : last + 1])
+
+    def year_to_date(self, idx):
+        """Debit - credit from the start of the fiscal year to the end of period `idx`."""
+        return self.year_opening + self.movement(0, idx)
+
+
+class AccountTree:
+    """AccountBalances of accounts and group accounts (the sum of their subtree)."""
+
+    def __init__(self, accounts, balances, periods):
+        self.periods = periods
+        self.balances = balances
+        self.accounts_by_lft = sorted(
+            (account.lft, account.name) for account in accounts if account.name in balances
+        )
+        self.lfts = [lft for lft, _name in self.accounts_by_lft]
+
+    def get_balances(self, account):
+        balances = AccountBalances(self.periods)
+        start, end = bisect_left(self.lfts, account.lft), bisect_right(self.lfts, account.rgt)
+        for _lft, name in self.accounts_by_lft[start:end]:
+            balances.add(self.balances[name])
+
+        return balances
+
+
+def get_account_subtree(accounts, account):
+    """Names of `account` and all its descendants among `accounts` (by lft / rgt)."""
+    return [d.name for d in accounts if d.lft >= account.lft and d.rgt <= account.rgt]
+
+
+class LedgerView:
+    """Company accounts and their balances, as aggregated by the report rows."""
+
+    def __init__(self, periods, accounts, balances=None):
+        self.periods = periods
+        self.accounts = accounts
+        self._balances = balances
+        # structures derived from the balances (period ledger, P&L), built on first use
+        self.derived = {}
+
+    def get_balances(self):
+        """{account: AccountBalances}"""
+        return self._balances
+
+    def get_accounts(self, **filters):
+        """Accounts of the company matching all `filters` (e.g. report_type="Balance Sheet")."""
+        return [
+            account
+            for account in self.accounts
+            if all(account.get(field) == value for field, value in filters.items())
+        ]
+
+    def get_tree(self, **filters):
+        return AccountTree(self.get_accounts(**filters), self.get_balances(), self.periods)
+
+
+class LedgerScan(LedgerView):
+    """
+    Ledger totals of one report, read in a single pass: debit and credit per
+    account, period bucket, finance book and cost center (and project, when
+    the report is split by project), held column-wise.
+
+    Buckets 0..n are the report periods; entries before the first period are in
+    BEFORE_FIRST_PERIOD (same fiscal year) or BEFORE_FISCAL_YEAR. Opening
+    entries of the fiscal year are in BEFORE_FIRST_PERIOD whatever their
+    posting date, as in the Trial Balance. Income and expense entries before the
+    fiscal year are not read.
+    """
+
+    def __init__(self, period_list, accounts, rows, dimensions=DIMENSIONS):
+        super().__init__(len(period_list), accounts)
+
+        self.account_names = []
+        self.account = array("i")
+        self.bucket = array("i")
+        self.debit = array("d")
+        self.credit = array("d")
+        # interned values and per-row value index of every dimension
+        self.dimension_values = {dimension: [] for dimension in dimensions}
+        self.dimension_columns = {dimension: array("i") for dimension in dimensions}
+
+        columns = [(self.account, self.account_names, "account")]
+        columns += [
+            (self.dimension_columns[dimension], self.dimension_values[dimension], dimension)
+            for dimension in dimensions
+        ]
+        lookups = [{} for _column in columns]
+
+        for row in rows:
+            for (column, names, fieldname), lookup in zip(columns, lookups, strict=True):
+                value = cstr(row.get(fieldname))
+                if value not in lookup:
+                    lookup[value] = len(names)
+                    names.append(value)
+                column.append(lookup[value])
+
+            self.bucket.append(cint(row.bucket))
+            self.debit.append(flt(row.debit))
+            self.credit.append(flt(row.credit))
+
+    def get_balances(self):
+        """{account: AccountBalances} over all finance books and cost centers."""
+        if self._balances is None:
+            self._balances = self.get_filtered_balances()
+
+        return self._balances
+
+    def get_filtered_balances(self, dimension=None, values=None):
+        """{account: AccountBalances}, optionally of the given `values` of `dimension` only."""
+        balances = {}
+        if not dimension:
+            for idx in range(len(self.account)):
+                self.add_row(balances, idx)
+        else:
+            values = set(values)
+            for value_idx, value_balances in self.get_dimension_balances(dimension).items():
+                if self.dimension_values[dimension][value_idx] not in values:
+                    continue
+
+                for account_idx, account_balances in value_balances.items():
+                    if account_idx not in balances:
+                        balances[account_idx] = AccountBalances(self.periods)
+                    balances[account_idx].add(account_balances)
+
+        return {self.account_names[idx]: account_balances for idx, account_balances in balances.items()}
+
+    def get_dimension_balances(self, dimension):
+        """
+        {value index: {account index: AccountBalances}} of `dimension`, bucketed in
+        one pass over the rows and shared by the views of all its values.
+        """
+        key = ("dimension_balances", dimension)
+        if key not in self.derived:
+            column = self.dimension_columns[dimension]
+            by_value = {}
+            for idx in range(len(self.account)):
+                self.add_row(by_value.setdefault(column[idx], {}), idx)
+
+            self.derived[key] = by_value
+
+        return self.derived[key]
+
+    def get_period_values(self, dimension):
+        """Values of `dimension` with entries in the report periods, not only before them."""
+        column = self.dimension_columns[dimension]
+        return {
+            self.dimension_values[dimension][column[idx]] for idx in range(len(self.bucket)) if self.bucket[idx] >= 0
+        }
+
+    def add_row(self, balances, idx):
+        """Add row `idx` to the AccountBalances of its account in `balances` ({account index: ...})."""
+        account_balances = balances.get(self.account[idx])
+        if account_balances is None:
+            account_balances = balances[self.account[idx]] = AccountBalances(self.periods)
+
+        bucket = self.bucket[idx]
+        if bucket < 0:
+            account_balances.opening += self.debit[idx] - self.credit[idx]
+            if bucket == BEFORE_FIRST_PERIOD:
+                account_balances.year_opening += self.debit[idx] - self.credit[idx]
+        else:
+            account_balances.debit[bucket] += self.debit[idx]
+            account_balances.credit[bucket] += self.credit[idx]
+
+    def get_view(self, dimension, values):
+        """LedgerView of the entries with one of `values` of `dimension`, without another query."""
+        key = ("view", dimension, tuple(sorted(values)))
+        if key not in self.derived:
+            self.derived[key] = LedgerView(
+                self.periods, self.accounts, self.get_filtered_balances(dimension, values)
+            )
+
+        return self.derived[key]
+
+
+def get_scan_dimensions(filters):
+    """Dimensions to group the scan by: a report split by project also needs the project."""
+    if filters.get("split_by") == "Project":
+        return (*DIMENSIONS, "project")
+
+    return DIMENSIONS
+
+
+def get_scan_key(period_list, filters):
+    return (
+        tuple((p["key"], cstr(p["from_date"]), cstr(p["to_date"])) for p in period_list),
+        get_dimension_context(filters).key,
+        get_scan_dimensions(filters),
+    )
+
+
+def get_ledger_scan(period_list, filters):
+    """
+    LedgerScan for the report periods, read once per request for a given set of
+    filters. With `split_values` (dimension, values) in the filters, the
+    LedgerView of those values within that scan.
+    """
+    key = get_scan_key(period_list, filters)
+
+    scans = frappe.local.request_cache["cash_flow_ledger_scan"]
+    if key not in scans:
+        dimensions = get_scan_dimensions(filters)
+        scans[key] = LedgerScan(
+            period_list,
+            get_company_accounts(filters.company),
+            get_ledger_scan_rows(period_list, filters, dimensions),
+            dimensions,
+        )
+
+    if filters.get("split_values"):
+        return scans[key].get_view(*filters.split_values)
+
+    return scans[key]
+
+
+def get_company_accounts(company):
+    """Accounts of `company` in tree order, read once per request."""
+    accounts = frappe.local.request_cache["cash_flow_company_accounts"]
+    if company not in accounts:
+        accounts[company] = frappe.get_all(
+            "Account",
+            filters={"company": company},
+            fields=[
+                "name",
+                "account_name",
+                "account_number",
+                "account_type",
+                "parent_account",
+                "root_type",
+                "report_type",
+                "lft",
+                "rgt",
+                "is_group",
+            ],
+            order_by="lft",
+        )
+
+    return accounts[company]
+
+
+def get_ledger_scan_rows(period_list, filters, scan_dimensions=DIMENSIONS):
+    dimensions = get_dimension_context(filters)
+    cond, values = dimensions.get_conditions(alias="gle")
+    values.update(
+        {
+            "company": filters.company,
+            "year_start_date": get_fiscal_year(period_list[0]["to_date"], company=filters.company)[1],
+            "from_date": period_list[0]["from_date"],
+            "to_date": period_list[-1]["to_date"],
+        }
+    )
+
+    buckets = []
+    for idx, period in enumerate(period_list):
+        values[f"to_date_{idx}"] = period["to_date"]
+        buckets.append(f"when gle.posting_date <= %(to_date_{idx})s then {idx}")
+
+    ledger_table, ledger_cond = get_ledger_source(dimensions.requires_gl_entry, dimensions.company)
+    group_by = ", ".join(f"gle.{dimension}" for dimension in scan_dimensions)
+
+    return frappe.db.sql(
+        f"""
+        select gle.account, bucket, {group_by},
+            sum(gle.debit) as debit, sum(gle.credit) as credit
+        from (
+            select gle.account, {group_by}, gle.debit, gle.credit,
+                case
+                    when gle.posting_date < %(year_start_date)s then {BEFORE_FISCAL_YEAR}
+                    when gle.posting_date < %(from_date)s or gle.is_opening = 'Yes' then {BEFORE_FIRST_PERIOD}
+                    {" ".join(buckets)}
+                end as bucket
+            from {ledger_table} gle
+            inner join `tabAccount` acc on acc.name = gle.account
+            where gle.company=%(company)s and gle.posting_date <= %(to_date)s
+                and (acc.report_type = 'Balance Sheet' or gle.posting_date >= %(year_start_date)s)
+                {ledger_cond} {cond}
+        ) gle
+        group by gle.account, bucket, {group_by}
+    """,
+        values,
+        as_dict=True,
+    )
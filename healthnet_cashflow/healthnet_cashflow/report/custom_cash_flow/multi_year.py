@@ -0,0 +1,163 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import add_days, cstr, getdate
+
+from erpnext.accounts.utils import get_fiscal_year
+
+# balance rows whose total is the first / last year's total instead of the sum
+OPENING_ROWS = ("'Opening Cash and Bank Balance'",)
+CLOSING_ROWS = ("'Closing Cash and Bank Balance'",)
+
+
+def get_fiscal_year_filters(filters):
+    """One copy of `filters` per fiscal year in the report period, clipped to the period."""
+    year_filters = []
+    start_date, end_date = getdate(filters.period_start_date), getdate(filters.period_end_date)
+    from_date = start_date
+
+    while from_date <= end_date:
+        fiscal_year, year_start_date, year_end_date = get_fiscal_year(from_date, company=filters.company)[:3]
+
+        year = frappe._dict(filters.copy())
+        year.update(
+            {
+                "from_fiscal_year": fiscal_year,
+                "to_fiscal_year": fiscal_year,
+                "period_start_date": max(start_date, getdate(year_start_date)),
+                "period_end_date": min(end_date, getdate(year_end_date)),
+            }
+        )
+        year_filters.append(year)
+        from_date = add_days(year_end_date, 1)
+
+    return year_filters
+
+
+def merge_fiscal_year_results(results):
+    """
+    Merge the `execute()` results of consecutive fiscal years into one result
+    with the period columns of every year, in order.
+
+    Returns (columns, data, report_summary).
+    """
+    columns = merge_columns([result[0] for result in results])
+    data = merge_data([(result[0], result[1]) for result in results])
+    report_summary = merge_report_summary([result[4] for result in results])
+
+    return columns, data, report_summary
+
+
+def get_period_columns(columns):
+    return [column for column in columns[2:] if column.get("fieldname") != "total"]
+
+
+def merge_columns(year_columns):
+    columns = list(year_columns[0][:2])
+    for year in year_columns:
+        columns.extend(get_period_columns(year))
+
+    total_column = next(
+        (column for year in year_columns for column in year if column.get("fieldname") == "total"), None
+    )
+    if total_column:
+        columns.append(total_column)
+
+    return columns
+
+
+def get_row_key(row):
+    return cstr(row.get("section")), cstr(row.get("parent_section"))
+
+
+class RowLayout:
+    """
+    Rows of several results merged by `get_row_key`: the rows of the first
+    result in order, and every row only present in a later result placed after
+    its predecessor there. Rows are linked to their predecessor as they are
+    added and laid out once in `get_data`, instead of searching the merged list
+    for every insert.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.rows = {get_row_key(row): row for row in data if row}
+        self.after = {}
+        self.tail = []
+
+    def merge(self, data, value_keys):
+        """
+        Match the rows of a later result: yields (row, merged row), adding the
+        rows not seen yet without their `value_keys`.
+        """
+        previous = None
+        for row in data:
+            if not row:
+                continue
+
+            key = get_row_key(row)
+            merged = self.rows.get(key)
+            if merged is None:
+                merged = self.rows[key] = get_row_fields(row, value_keys)
+                if previous is None:
+                    self.tail.append(merged)
+                else:
+                    self.after.setdefault(id(previous), []).append(merged)
+
+            yield row, merged
+            previous = merged
+
+    def get_data(self):
+        data = []
+        stack = [*reversed(self.tail), *reversed(self.data)]
+        while stack:
+            row = stack.pop()
+            data.append(row)
+            stack.extend(reversed(self.after.get(id(row), ())))
+
+        return data
+
+
+def get_row_fields(row, value_keys):
+    """Fields of `row` other than its values, for a merged row first seen in a later result."""
+    return {k: v for k, v in row.items() if k not in value_keys}
+
+
+def merge_data(years):
+    _columns, first_data = years[0]
+    layout = RowLayout([dict(row) for row in first_data])
+
+    for columns, year_data in years[1:]:
+        period_keys = [column["fieldname"] for column in get_period_columns(columns)]
+
+        for row, merged in layout.merge(year_data, (*period_keys, "total")):
+            for period_key in period_keys:
+                merged[period_key] = row.get(period_key)
+
+            merged["total"] = merge_total(get_row_key(row)[0], merged.get("total"), row.get("total"))
+
+    return layout.get_data()
+
+
+def merge_total(section, merged_total, year_total):
+    if section in OPENING_ROWS:
+        return merged_total
+    if section in CLOSING_ROWS:
+        return year_total
+    if merged_total is None and year_total is None:
+        return None
+
+    return (merged_total or 0) + (year_total or 0)
+
+
+def merge_report_summary(year_summaries):
+    report_summary = {}
+    for summary in year_summaries:
+        for item in summary or []:
+            if item["label"] in report_summary:
+                report_summary[item["label"]]["value"] += item["value"] or 0
+            else:
+                report_summary[item["label"]] = dict(item)
+
+    return list(report_summary.values())
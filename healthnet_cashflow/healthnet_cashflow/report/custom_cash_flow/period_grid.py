@@ -0,0 +1,69 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+from array import array
+
+from frappe.utils import flt
+
+# roles of the rows in the totals: part of the operating profit, of a section
+# total (`("section", name)`), of the net increase in cash
+OP_PROFIT = "op_profit"
+NET_CASH = "net_cash"
+
+
+def get_period_total(values, accumulated_values=False, balance_type=None):
+    """
+    Total of a row's per-period `values`: their sum, the last value for
+    accumulated (year-to-date) values, or the first / last value for opening /
+    closing balances.
+    """
+    if not values:
+        return 0.0
+    if balance_type == "opening":
+        return values[0]
+    if balance_type == "closing" or accumulated_values:
+        return values[-1]
+
+    return sum(values)
+
+
+class PeriodGrid:
+    """
+    Numeric core of a report: the values of its rows, rows x columns, in one
+    array("d"), with an index of the rows playing each role in the totals.
+
+    Columns are the period keys followed by "total". Totals are column sums
+    over the rows of a role, with the builtin zip / sum over array slices
+    instead of nested loops over row dicts.
+    """
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.width = len(self.keys)
+        self.columns = {key: idx for idx, key in enumerate(self.keys)}
+        self.values = array("d")
+        self.roles = {}
+
+    def add(self, row, roles=()):
+        """Append the values of `row` (missing / None as 0) and index it under `roles`."""
+        idx = len(self.values) // self.width
+        self.values.extend(flt(row.get(key)) for key in self.keys)
+        for role in roles:
+            self.roles.setdefault(role, []).append(idx)
+
+        return idx
+
+    def get_row(self, idx):
+        return self.values[idx * self.width : (idx + 1) * self.width]
+
+    def sum(self, role):
+        """Column sums over the rows of `role` (zeros without any)."""
+        rows = [self.get_row(idx) for idx in self.roles.get(role, ())]
+        if not rows:
+            return [0.0] * self.width
+
+        return [sum(column) for column in zip(*rows, strict=True)]
+
+    def as_row(self, values, keys=None):
+        """{key: value} of a list of column values, for the given `keys` (all columns by default)."""
+        return {key: values[self.columns[key]] for key in keys or self.keys}
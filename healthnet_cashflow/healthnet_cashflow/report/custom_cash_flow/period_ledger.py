@@ -0,0 +1,41 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.account_index import AccountIndex
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.ledger_scan import get_ledger_scan
+
+
+class PeriodLedger:
+    """
+    Balance sheet account balances bucketed by period boundary: the opening
+    balance before the first period and the debit / credit of every period.
+
+    Account labels are resolved with the same matching rules as the Trial
+    Balance (see AccountIndex); a group account's balances are the sum of its
+    subtree.
+    """
+
+    def __init__(self, scan):
+        accounts = scan.get_accounts(report_type="Balance Sheet")
+        self.index = AccountIndex(accounts)
+        self.tree = scan.get_tree(report_type="Balance Sheet")
+
+    def get_account(self, label):
+        return self.index.find(label)
+
+    def get_balances(self, label):
+        """Balances of the first account matching `label` (with its subtree), or None."""
+        account = self.get_account(label)
+        if not account:
+            return None
+
+        return self.tree.get_balances(account)
+
+
+def get_period_ledger(period_list, filters):
+    """PeriodLedger for the report periods, built from the report's ledger scan."""
+    scan = get_ledger_scan(period_list, filters)
+    if "period_ledger" not in scan.derived:
+        scan.derived["period_ledger"] = PeriodLedger(scan)
+
+    return scan.derived["period_ledger"]
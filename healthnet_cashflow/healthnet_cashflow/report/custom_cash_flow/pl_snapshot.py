@@ -0,0 +1,114 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.utils import cint, flt
+
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.ledger_scan import get_ledger_scan
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.period_grid import get_period_total
+
+
+class ProfitAndLossSnapshot:
+    """
+    Income and expense per period, read from the report's ledger scan with the
+    conventions of the Profit and Loss Statement: income as credit - debit,
+    expense as debit - credit, values from the first period on (accumulated
+    with `accumulated_values`), rounded to three decimals.
+    """
+
+    def __init__(self, scan, period_list, accumulated_values):
+        self.period_list = period_list
+        self.accumulated_values = accumulated_values
+        self.income = scan.get_accounts(root_type="Income")
+        self.expense = scan.get_accounts(root_type="Expense")
+        self.tree = scan.get_tree(report_type="Profit and Loss")
+
+    def get_values(self, balances, sign):
+        values = []
+        for idx in range(len(self.period_list)):
+            value = balances.movement(0 if self.accumulated_values else idx, idx)
+            values.append(flt(value * sign, 3))
+
+        return values
+
+    def get_root_total(self, accounts, sign):
+        totals = [0.0] * len(self.period_list)
+        for account in accounts:
+            account_balances = self.tree.balances.get(account.name)
+            if not account_balances:
+                continue
+
+            totals = [a + b for a, b in zip(totals, self.get_values(account_balances, sign), strict=True)]
+
+        return totals
+
+    def get_net_profit_loss(self, period_list, company):
+        """Net profit row as returned by the Profit and Loss Statement, or None without any value."""
+        income = self.get_root_total(self.income, -1)
+        expense = self.get_root_total(self.expense, 1)
+
+        net_profit_loss = {
+            "account_name": "'" + _("Profit for the year") + "'",
+            "account": "'" + _("Profit for the year") + "'",
+            "warn_if_negative": True,
+            "currency": frappe.get_cached_value("Company", company, "default_currency"),
+        }
+
+        for period, total_income, total_expense in zip(period_list, income, expense, strict=True):
+            net_profit_loss[period["key"]] = flt(total_income, 3) - flt(total_expense, 3)
+
+        net_profit_loss["total"] = get_period_total(
+            [net_profit_loss[period["key"]] for period in period_list], self.accumulated_values
+        )
+
+        if any(net_profit_loss[period["key"]] for period in period_list):
+            return net_profit_loss
+
+    def get_matching_rows(self, parent_pattern, name_pattern):
+        """Account rows whose parent and name contain the given (upper-case) patterns."""
+        rows = []
+        for account in match_accounts(self.income + self.expense, parent_pattern, name_pattern):
+            sign = -1 if account.root_type == "Income" else 1
+            values = self.get_values(self.tree.get_balances(account), sign)
+
+            row = {
+                "account": account.name,
+                "parent_account": account.parent_account,
+                "account_name": get_display_name(account),
+            }
+            row.update({period["key"]: value for period, value in zip(self.period_list, values, strict=True)})
+            rows.append(row)
+
+        return rows
+
+
+def get_display_name(account):
+    """Account name as shown in the Profit and Loss Statement ("number - name")."""
+    if account.account_number:
+        return f"{account.account_number} - {account.account_name}"
+
+    return account.account_name
+
+
+def match_accounts(accounts, parent_pattern, name_pattern):
+    """Accounts whose parent and display name contain the given (upper-case) patterns."""
+    return [
+        account
+        for account in accounts
+        if parent_pattern in (account.parent_account or "").upper()
+        and name_pattern in (get_display_name(account) or "").upper()
+    ]
+
+
+def get_pl_snapshot(period_list, filters):
+    """
+    Profit and Loss for `period_list`, built once per request from the report's
+    ledger scan and shared by the net profit and the interest rows.
+    """
+    scan = get_ledger_scan(period_list, filters)
+    key = ("pl_snapshot", cint(filters.accumulated_values))
+    if key not in scan.derived:
+        scan.derived[key] = ProfitAndLossSnapshot(scan, period_list, cint(filters.accumulated_values))
+
+    return scan.derived[key]
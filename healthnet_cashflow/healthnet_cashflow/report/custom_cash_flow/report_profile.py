@@ -0,0 +1,95 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+import json
+from contextlib import contextmanager
+from time import perf_counter
+
+import frappe
+from frappe.utils import cint, escape_html
+
+from healthnet_cashflow.utils.query_stats import QueryStats
+
+
+class ReportProfile:
+    """Wall time, SQL query count and SQL time per stage of one report run."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stages = {}
+        self.started = perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        start = perf_counter()
+        with QueryStats() as stats:
+            yield
+
+        stage = self.stages.setdefault(
+            name, {"calls": 0, "wall_time": 0.0, "queries": 0, "rows": 0, "sql_time": 0.0}
+        )
+        stage["calls"] += 1
+        stage["wall_time"] += perf_counter() - start
+        stage["queries"] += stats.count
+        stage["rows"] += stats.rows
+        stage["sql_time"] += stats.time
+
+    def as_dict(self):
+        return {
+            "wall_time": round(perf_counter() - self.started, 6),
+            "stages": {
+                name: {key: round(value, 6) for key, value in stage.items()}
+                for name, stage in self.stages.items()
+            },
+        }
+
+    def as_html(self):
+        rows = "".join(
+            f"<tr><td>{escape_html(name)}</td><td>{stage['calls']}</td>"
+            f"<td>{stage['wall_time']:.4f}</td><td>{stage['queries']}</td>"
+            f"<td>{stage['rows']}</td><td>{stage['sql_time']:.4f}</td></tr>"
+            for name, stage in self.stages.items()
+        )
+        return (
+            '<table class="table table-bordered table-condensed">'
+            "<thead><tr><th>Stage</th><th>Calls</th><th>Wall Time (s)</th><th>Queries</th>"
+            f"<th>Rows</th><th>SQL Time (s)</th></tr></thead><tbody>{rows}</tbody></table>"
+        )
+
+    def log(self, filters):
+        if not self.enabled:
+            return
+
+        frappe.logger("healthnet_cashflow.profile", allow_site=True).info(
+            json.dumps(
+                {
+                    "report": "Custom Cash Flow",
+                    "company": filters.company,
+                    "from_fiscal_year": filters.from_fiscal_year,
+                    "to_fiscal_year": filters.to_fiscal_year,
+                    "periodicity": filters.periodicity,
+                    "user": frappe.session.user,
+                    **self.as_dict(),
+                },
+                default=str,
+            )
+        )
+
+
+def start_profile(filters):
+    """
+    Start profiling the current report run. Profiling is on when the `debug_profile`
+    filter (also shown in the report response) or the `cash_flow_profile` site
+    config (structured log line only) is set.
+    """
+    enabled = bool(cint(filters.get("debug_profile")) or cint(frappe.conf.get("cash_flow_profile")))
+    frappe.local.cash_flow_profile = ReportProfile(enabled)
+    return frappe.local.cash_flow_profile
+
+
+def get_profile():
+    return getattr(frappe.local, "cash_flow_profile", None) or ReportProfile()
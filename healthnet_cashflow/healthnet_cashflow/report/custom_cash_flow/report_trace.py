@@ -0,0 +1,44 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import cint
+
+
+class ReportTrace:
+    """In-memory diagnostics for one report run, written out in a single Error Log."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.entries = []
+
+    def add(self, title, message=None):
+        if self.enabled:
+            self.entries.append({"title": title, "message": message})
+
+    def as_text(self):
+        return "\n".join(f"{entry['title']}: {entry['message']}" for entry in self.entries)
+
+    def flush(self, title="Custom Cash Flow Trace"):
+        if self.enabled and self.entries:
+            frappe.log_error(title=title, message=self.as_text())
+
+        self.entries = []
+
+
+def start_trace(filters):
+    """
+    Start a trace for the current request. Tracing is off unless the `debug_trace`
+    filter or the `cash_flow_debug_trace` site config is set.
+    """
+    enabled = bool(cint(filters.get("debug_trace")) or cint(frappe.conf.get("cash_flow_debug_trace")))
+    frappe.local.cash_flow_trace = ReportTrace(enabled)
+    return frappe.local.cash_flow_trace
+
+
+def get_trace():
+    return getattr(frappe.local, "cash_flow_trace", None) or ReportTrace()
+
+
+def trace(title, message=None):
+    get_trace().add(title, message)
@@ -0,0 +1,137 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.utils import cstr
+
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.consolidated import (
+    get_consolidated_companies,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.dimensions import get_filter_values
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.ledger_scan import get_ledger_scan
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.multi_year import (
+    RowLayout,
+    get_row_fields,
+    merge_report_summary,
+)
+
+# `split_by` filter → ledger scan dimension
+SPLIT_DIMENSIONS = {"Cost Center": "cost_center", "Project": "project"}
+
+
+def validate_split_filters(filters):
+    if filters.split_by not in SPLIT_DIMENSIONS:
+        frappe.throw(_("Split By must be Cost Center or Project"))
+
+    if filters.from_fiscal_year != filters.to_fiscal_year:
+        frappe.throw(_("A split report cannot span more than one fiscal year"))
+
+    if get_consolidated_companies(filters):
+        frappe.throw(_("A split report cannot be consolidated"))
+
+
+def get_split_filters(filters, period_list):
+    """
+    One copy of `filters` per column group of a report split by cost center or
+    project, with the `split_values` its rows are aggregated from.
+
+    Selected cost centers (or projects) are one group each, a cost center with
+    its subtree; without a selection, every value posted to in the report period
+    is a group (values with opening balances only are not). All groups are views
+    of the same ledger scan, bucketed by value once.
+    """
+    dimension = SPLIT_DIMENSIONS[filters.split_by]
+    selected = get_filter_values(filters.get(dimension))
+
+    if dimension == "cost_center" and selected:
+        groups = get_cost_center_subtrees(filters.company, selected)
+    elif selected:
+        groups = [(project, [project]) for project in selected]
+    else:
+        values = get_ledger_scan(period_list, filters).get_period_values(dimension)
+        groups = [(value or _("Not Set"), [value]) for value in sorted(values, key=lambda v: (not v, v))]
+
+    split_filters = []
+    for label, values in groups:
+        split_filter = frappe._dict(filters.copy())
+        split_filter.split_label = label
+        split_filter.split_values = (dimension, tuple(values))
+        split_filters.append(split_filter)
+
+    return split_filters
+
+
+def get_cost_center_subtrees(company, names):
+    """[(cost center, its subtree)] of `names`, from one read of the company's cost centers."""
+    cost_centers = frappe.get_all(
+        "Cost Center", filters={"company": company}, fields=["name", "lft", "rgt"], order_by="lft"
+    )
+    by_name = {cost_center.name: cost_center for cost_center in cost_centers}
+
+    subtrees = []
+    for name in names:
+        parent = by_name.get(name)
+        if not parent:
+            subtrees.append((name, [name]))
+            continue
+
+        subtrees.append(
+            (
+                name,
+                [cc.name for cc in cost_centers if cc.lft >= parent.lft and cc.rgt <= parent.rgt],
+            )
+        )
+
+    return subtrees
+
+
+def get_split_fieldname(idx, fieldname):
+    return f"{fieldname}__{idx}"
+
+
+def merge_split_results(columns, results):
+    """
+    Merge the results of the column groups of a split report, `[(label, data,
+    report_summary)]`, into one result with the value columns of every group.
+
+    Returns (columns, data, report_summary).
+    """
+    value_fieldnames = [column["fieldname"] for column in columns[2:]]
+
+    merged_columns = list(columns[:2])
+    for idx, (label, _data, _summary) in enumerate(results):
+        merged_columns.extend(
+            {
+                **column,
+                "fieldname": get_split_fieldname(idx, column["fieldname"]),
+                "label": f"{label}: {cstr(column.get('label'))}",
+            }
+            for column in columns[2:]
+        )
+
+    # the first group's rows (including the blank separators) give the layout
+    layout = RowLayout([get_row_fields(row, value_fieldnames) for row in results[0][1]])
+    for idx, (_label, split_data, _summary) in enumerate(results):
+        for row, merged in layout.merge(split_data, value_fieldnames):
+            for fieldname in value_fieldnames:
+                merged[get_split_fieldname(idx, fieldname)] = row.get(fieldname)
+
+    data = layout.get_data()
+
+    report_summary = merge_report_summary([summary for _label, _data, summary in results])
+
+    return merged_columns, data, report_summary
+
+
+def get_split_chart_columns(columns, results):
+    """Label columns and the total column of every group, for a chart of the group totals."""
+    return [
+        *columns[:2],
+        *(
+            {**column, "fieldname": get_split_fieldname(idx, "total"), "label": label}
+            for column in columns[2:]
+            if column.get("fieldname") == "total"
+            for idx, (label, _data, _summary) in enumerate(results)
+        ),
+    ]
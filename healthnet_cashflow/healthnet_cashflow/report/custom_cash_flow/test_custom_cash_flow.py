@@ -0,0 +1,310 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import flt, getdate
+
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.account_index import AccountIndex
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.consolidated import merge_company_results
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.custom_cash_flow import iter_cash_flow_data
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.ledger_scan import (
+    BEFORE_FIRST_PERIOD,
+    BEFORE_FISCAL_YEAR,
+    LedgerScan,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.multi_year import (
+    CLOSING_ROWS,
+    OPENING_ROWS,
+    get_row_key,
+    merge_data,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.period_grid import (
+    PeriodGrid,
+    get_period_total,
+)
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.split import get_split_filters
+from healthnet_cashflow.utils.report_payload import to_columnar
+
+LEDGER_SCAN = "healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.ledger_scan"
+COMPANY = "_Test Cash Flow Company"
+
+PERIOD_LIST = [
+    frappe._dict(key="jan_2026", from_date=getdate("2026-01-01"), to_date=getdate("2026-01-31")),
+    frappe._dict(key="feb_2026", from_date=getdate("2026-02-01"), to_date=getdate("2026-02-28")),
+]
+VALUE_KEYS = ("jan_2026", "feb_2026", "total")
+COLUMNS = [
+    {"fieldname": "section", "fieldtype": "Data"},
+    {"fieldname": "section_name", "fieldtype": "Data"},
+    {"fieldname": "jan_2026", "fieldtype": "Currency"},
+    {"fieldname": "feb_2026", "fieldtype": "Currency"},
+    {"fieldname": "total", "fieldtype": "Currency"},
+]
+
+
+def make_account(name, lft, rgt, root_type, parent_account=None, account_type=None, is_group=0):
+    return frappe._dict(
+        name=name,
+        account_name=name,
+        account_number=None,
+        account_type=account_type,
+        parent_account=parent_account,
+        root_type=root_type,
+        report_type="Balance Sheet" if root_type in ("Asset", "Liability", "Equity") else "Profit and Loss",
+        lft=lft,
+        rgt=rgt,
+        is_group=is_group,
+    )
+
+
+ACCOUNTS = [
+    make_account("Application of Funds (Assets)", 1, 8, "Asset", is_group=1),
+    make_account("Accounts Receivable", 2, 3, "Asset", "Application of Funds (Assets)", "Receivable"),
+    make_account("Bank Accounts", 4, 5, "Asset", "Application of Funds (Assets)", "Bank"),
+    make_account("Cash In Hand", 6, 7, "Asset", "Application of Funds (Assets)", "Cash"),
+    make_account("Capital Stock", 9, 10, "Equity", account_type="Equity"),
+    make_account("Sales", 11, 12, "Income", account_type="Income Account"),
+    make_account("FINANCE COST", 13, 16, "Expense", is_group=1),
+    make_account("INTEREST ON LOAN", 14, 15, "Expense", "FINANCE COST"),
+]
+
+
+def gl(account, bucket, debit=0, credit=0, cost_center="CC1"):
+    """A ledger scan row: the totals of `account` in one period bucket and cost center."""
+    return frappe._dict(
+        account=account, bucket=bucket, finance_book=None, cost_center=cost_center, debit=debit, credit=credit
+    )
+
+
+# opening capital, a sale invoiced under CC1 in Jan and collected under CC2 in
+# Feb, and interest paid in both months
+LEDGER = [
+    gl("Bank Accounts", BEFORE_FIRST_PERIOD, debit=1000),
+    gl("Capital Stock", BEFORE_FIRST_PERIOD, credit=1000),
+    gl("Accounts Receivable", 0, debit=250),
+    gl("Sales", 0, credit=250),
+    gl("Bank Accounts", 1, debit=250, cost_center="CC2"),
+    gl("Accounts Receivable", 1, credit=250, cost_center="CC2"),
+    gl("INTEREST ON LOAN", 0, debit=10),
+    gl("Bank Accounts", 0, credit=10),
+    gl("INTEREST ON LOAN", 1, debit=40, cost_center="CC2"),
+    gl("Bank Accounts", 1, credit=40, cost_center="CC2"),
+]
+
+
+def get_filters(**filters):
+    return frappe._dict({"company": COMPANY, "accumulated_values": 0, **filters})
+
+
+def get_rows(data):
+    return {get_row_key(row): row for row in data if row}
+
+
+def get_row(data, section):
+    return next(row for row in data if row and row.get("section") == section)
+
+
+def get_values(row):
+    return [row.get(key) for key in VALUE_KEYS]
+
+
+class TestCustomCashFlow(FrappeTestCase):
+    def setUp(self):
+        frappe.local.request_cache.clear()
+
+    @contextmanager
+    def ledger(self, rows=LEDGER):
+        with (
+            patch(f"{LEDGER_SCAN}.get_company_accounts", return_value=ACCOUNTS),
+            patch(f"{LEDGER_SCAN}.get_ledger_scan_rows", return_value=rows),
+        ):
+            yield
+
+    def get_data(self, filters, summary_data=None):
+        with self.ledger():
+            return list(iter_cash_flow_data(filters, PERIOD_LIST, {} if summary_data is None else summary_data))
+
+    def test_split_groups_add_up_to_the_report(self):
+        filters = get_filters(split_by="Cost Center")
+        unsplit = get_rows(self.get_data(filters))
+
+        with self.ledger():
+            split_filters = get_split_filters(filters, PERIOD_LIST)
+            groups = [get_rows(iter_cash_flow_data(group, PERIOD_LIST, {})) for group in split_filters]
+
+        self.assertEqual([group.split_label for group in split_filters], ["CC1", "CC2"])
+
+        for key, row in unsplit.items():
+            for value_key in VALUE_KEYS:
+                self.assertAlmostEqual(
+                    sum(flt(group.get(key, {}).get(value_key)) for group in groups),
+                    flt(row.get(value_key)),
+                    msg=f"{key[0]} {value_key}",
+                )
+
+    def test_split_skips_values_with_opening_balances_only(self):
+        rows = [*LEDGER, gl("Bank Accounts", BEFORE_FIRST_PERIOD, debit=5, cost_center="Old CC")]
+        with self.ledger(rows):
+            split_filters = get_split_filters(get_filters(split_by="Cost Center"), PERIOD_LIST)
+
+        self.assertEqual([group.split_label for group in split_filters], ["CC1", "CC2"])
+
+    def test_interest_rows_are_per_period(self):
+        data = self.get_data(get_filters())
+
+        for section in ("Interest Expense", "Interest Paid"):
+            self.assertEqual(get_values(get_row(data, section)), [10, 40, 50])
+
+    def test_interest_rows_are_year_to_date_with_accumulated_values(self):
+        data = self.get_data(get_filters(accumulated_values=1))
+
+        for section in ("Interest Expense", "Interest Paid"):
+            self.assertEqual(get_values(get_row(data, section)), [10, 50, 50])
+
+    def test_totals_of_accumulated_values(self):
+        summary_data = {}
+        data = self.get_data(get_filters(accumulated_values=1), summary_data)
+
+        for row in data:
+            if not row or not row.get("currency"):
+                continue
+
+            values = [flt(row.get(key)) for key in VALUE_KEYS[:-1]]
+            expected = values[0] if row["section"] in OPENING_ROWS else values[-1]
+            self.assertAlmostEqual(flt(row["total"]), expected, msg=row["section"])
+
+        self.assertEqual(get_row(data, "Operating Profit before Working Capital Changes")["total"], 250)
+        self.assertEqual(get_row(data, "'Net Cash from Operating Activities'")["total"], 250)
+        self.assertEqual(summary_data["Net Cash from Operating Activities"], 250)
+        self.assertEqual(summary_data["Net increase in cash and cash equivalents"], 300)
+
+    def test_totals_of_period_values(self):
+        summary_data = {}
+        data = self.get_data(get_filters(), summary_data)
+
+        for row in data:
+            if not row or not row.get("currency"):
+                continue
+
+            values = [flt(row.get(key)) for key in VALUE_KEYS[:-1]]
+            if row["section"] in OPENING_ROWS:
+                expected = values[0]
+            elif row["section"] in CLOSING_ROWS:
+                expected = values[-1]
+            else:
+                expected = sum(values)
+            self.assertAlmostEqual(flt(row["total"]), expected, msg=row["section"])
+
+        self.assertEqual(summary_data["Net increase in cash and cash equivalents"], 300)
+
+    def test_consolidated_totals_match_the_company_report(self):
+        for accumulated_values in (0, 1):
+            self.setUp()
+            data = self.get_data(get_filters(accumulated_values=accumulated_values))
+
+            _columns, merged, _summary = merge_company_results(
+                [(COLUMNS, data, None, None, [])], [{}], "USD", accumulated_values=accumulated_values
+            )
+
+            self.assertEqual([get_row_key(row) for row in merged if row], list(get_rows(data)))
+            for key, row in get_rows(merged).items():
+                self.assertEqual(get_values(row), get_values(get_rows(data)[key]), msg=key[0])
+                if row.get("currency"):
+                    self.assertEqual(row["currency"], "USD")
+
+    def test_ledger_scan_buckets(self):
+        rows = [*LEDGER, gl("Bank Accounts", BEFORE_FISCAL_YEAR, debit=100)]
+        scan = LedgerScan(PERIOD_LIST, ACCOUNTS, rows)
+
+        bank = scan.get_balances()["Bank Accounts"]
+        self.assertEqual(bank.opening, 1100)
+        self.assertEqual(bank.year_opening, 1000)
+        self.assertEqual(bank.debit, [0, 250])
+        self.assertEqual(bank.credit, [10, 40])
+        self.assertEqual(bank.closing_balance(1), 1300)
+        self.assertEqual(bank.year_to_date(1), 1200)
+
+        cc2 = scan.get_filtered_balances("cost_center", ["CC2"])
+        self.assertEqual(set(cc2), {"Bank Accounts", "Accounts Receivable", "INTEREST ON LOAN"})
+        self.assertEqual(cc2["Bank Accounts"].opening, 0)
+        self.assertEqual(cc2["Bank Accounts"].movement(0, 1), 210)
+        self.assertEqual(scan.get_period_values("cost_center"), {"CC1", "CC2"})
+
+    def test_period_grid(self):
+        grid = PeriodGrid(VALUE_KEYS)
+        grid.add({"jan_2026": 1, "feb_2026": 2, "total": 3}, roles=("a",))
+        grid.add({"jan_2026": 10, "total": 10}, roles=("a", "b"))
+
+        self.assertEqual(grid.sum("a"), [11, 2, 13])
+        self.assertEqual(grid.as_row(grid.sum("b"), VALUE_KEYS[:-1]), {"jan_2026": 10, "feb_2026": 0})
+        self.assertEqual(grid.sum("c"), [0, 0, 0])
+
+    def test_get_period_total(self):
+        self.assertEqual(get_period_total([]), 0)
+        self.assertEqual(get_period_total([1, 2, 3]), 6)
+        self.assertEqual(get_period_total([1, 2, 3], accumulated_values=True), 3)
+        self.assertEqual(get_period_total([1, 2, 3], balance_type="opening"), 1)
+        self.assertEqual(get_period_total([1, 2, 3], accumulated_values=True, balance_type="opening"), 1)
+        self.assertEqual(get_period_total([1, 2, 3], balance_type="closing"), 3)
+
+    def test_account_index(self):
+        index = AccountIndex(
+            [
+                {"account_name": "1100 - Debtors"},
+                {"account_name": "Bank  Charges", "account_number": "5200"},
+                {"account_name": "Interest on Loan"},
+            ]
+        )
+
+        self.assertEqual(index.find("1100 - Debtors")["account_name"], "1100 - Debtors")
+        self.assertEqual(index.find("debtors")["account_name"], "1100 - Debtors")
+        self.assertEqual(index.find("1100")["account_name"], "1100 - Debtors")
+        self.assertEqual(index.find("BANK CHARGES")["account_number"], "5200")
+        self.assertEqual(index.find("5200")["account_name"], "Bank  Charges")
+        self.assertEqual(index.find("INTEREST")["account_name"], "Interest on Loan")
+        self.assertIsNone(index.find("Depreciation"))
+        self.assertEqual(index.find_all(""), [])
+
+    def test_merge_data_aligns_rows(self):
+        def row(section, value):
+            return {"section": section, "jan_2026": value, "total": value}
+
+        first = [row("A", 1), {}, row("C", 3)]
+        second = [row("A", 10), row("B", 20), {}, row("C", 30), row("D", 40)]
+
+        data = merge_data([(COLUMNS, first), (COLUMNS, second)])
+
+        self.assertEqual([row.get("section") for row in data], ["A", "B", None, "C", "D"])
+        self.assertEqual(get_row(data, "A")["total"], 11)
+        self.assertEqual(get_row(data, "B")["total"], 20)
+        self.assertEqual(get_row(data, "D")["jan_2026"], 40)
+
+    def test_to_columnar(self):
+        data = self.get_data(get_filters())
+        payload = to_columnar({"columns": COLUMNS, "result": data, "report_summary": []})
+
+        self.assertEqual(payload["currency"], "NGN")
+        self.assertEqual(payload["report_summary"], [])
+        self.assertEqual(len(payload["rows"]) + len(payload["spacers"]), len(data))
+
+        # rebuild the rows from the payload
+        rows = iter(zip(payload["rows"], payload["values"], strict=True))
+        fields = payload["row_fields"]
+        value_keys = [column["fieldname"] for column in payload["value_columns"]]
+        for idx, row in enumerate(data):
+            if idx in payload["spacers"]:
+                self.assertFalse(row)
+                continue
+
+            row_values, values = next(rows)
+            rebuilt = dict(zip(fields, row_values, strict=True))
+            self.assertEqual(bool(rebuilt.pop("has_currency")), bool(row.get("currency")))
+            self.assertEqual(
+                dict(zip(value_keys, values, strict=True)), {key: row.get(key) for key in value_keys}
+            )
+            self.assertEqual(rebuilt, {key: row.get(key) for key in rebuilt})
+            self.assertLessEqual(set(row) - {*value_keys, "currency"}, set(rebuilt))
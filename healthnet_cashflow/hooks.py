@@ -145,9 +145,47 @@ app_license = "mit"
 # 	}
 # }
 
+doc_events = {
+	"Account": {
+		"after_insert": "healthnet_cashflow.utils.ledger_changes.on_account_change",
+		"on_update": "healthnet_cashflow.utils.ledger_changes.on_account_change",
+		"after_rename": "healthnet_cashflow.utils.ledger_changes.on_account_change",
+		"on_trash": "healthnet_cashflow.utils.ledger_changes.on_account_change",
+	},
+	"GL Entry": {
+		"on_submit": [
+			"healthnet_cashflow.utils.ledger_changes.on_gl_entry_change",
+			"healthnet_cashflow.utils.period_balance.on_gl_entry_submit",
+		],
+		"on_cancel": [
+			"healthnet_cashflow.utils.ledger_changes.on_gl_entry_change",
+			"healthnet_cashflow.utils.period_balance.on_gl_entry_cancel",
+		],
+	},
+	"Period Closing Voucher": {
+		"on_submit": "healthnet_cashflow.utils.ledger_changes.on_gl_entry_change",
+		"on_cancel": "healthnet_cashflow.utils.ledger_changes.on_gl_entry_change",
+	},
+	"Repost Item Valuation": {
+		"on_submit": "healthnet_cashflow.utils.period_balance.on_repost_submit",
+	},
+	"Repost Accounting Ledger": {
+		"on_submit": "healthnet_cashflow.utils.period_balance.on_repost_submit",
+	},
+}
+
 # Scheduled Tasks
 # ---------------
 
+scheduler_events = {
+	"daily_long": [
+		"healthnet_cashflow.utils.period_balance.rebuild_all_period_balances",
+	],
+	"hourly_long": [
+		"healthnet_cashflow.utils.period_balance.rebuild_stale_period_balances",
+	],
+}
+
 # scheduler_events = {
 # 	"all": [
 # 		"healthnet_cashflow.tasks.all"
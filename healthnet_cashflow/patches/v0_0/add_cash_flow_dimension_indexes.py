@@ -0,0 +1,6 @@
+from healthnet_cashflow.utils.report_indexes import add_report_indexes
+
+
+def execute():
+    # adds the cost center / project indexes to sites that already have the others
+    add_report_indexes()
@@ -0,0 +1,5 @@
+from healthnet_cashflow.utils.report_indexes import add_report_indexes
+
+
+def execute():
+    add_report_indexes()
@@ -0,0 +1,5 @@
+from healthnet_cashflow.utils.period_balance import rebuild_period_balances
+
+
+def execute():
+    rebuild_period_balances()
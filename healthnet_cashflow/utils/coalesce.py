@@ -0,0 +1,105 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+"""
+Request coalescing for the report APIs: concurrent calls with the same report
+and normalized filters share one computation, across web workers.
+
+The first caller takes a Redis lock and publishes its result under a short-lived
+key; the others wait for that key instead of running the report again. Results
+are only shared between calls of the same user and language, and are dropped
+when a ledger changes.
+"""
+
+from time import sleep, time
+
+import frappe
+from frappe.utils import cint
+from redis.exceptions import LockError
+
+from healthnet_cashflow.utils.result_cache import get_cache_key
+
+RESULT_KEY = "healthnet_cashflow:coalesced_result:{0}"
+LOCK_KEY = "healthnet_cashflow:coalesce_lock:{0}"
+# every published result key, so they can be dropped together
+RESULT_INDEX_KEY = "healthnet_cashflow:coalesced_results"
+
+# seconds a published result is shared with callers that arrive late
+DEFAULT_RESULT_TTL = 30
+# seconds a computation may hold the lock, and waiters wait for it
+DEFAULT_LOCK_TIMEOUT = 600
+POLL_INTERVAL = 0.2
+
+
+def run_coalesced(report, report_filters, method, *args, **kwargs):
+    """
+    `method(*args, **kwargs)`, computed once for concurrent calls with the same
+    `report` and `report_filters`. Waiters fall back to computing themselves if
+    the owner of the computation fails or times out.
+
+    Every caller needs access to the report; a shared result is computed with
+    the permissions of the caller that ran it.
+    """
+    if not frappe.get_cached_doc("Report", report).is_permitted():
+        frappe.throw(frappe._("You don't have access to Report: {0}").format(report), frappe.PermissionError)
+
+    key = get_cache_key(
+        {
+            "report_name": report,
+            "coalesce_user": frappe.session.user,
+            "coalesce_lang": frappe.local.lang,
+            **(report_filters or {}),
+        }
+    )
+    result_key = RESULT_KEY.format(key)
+
+    result = frappe.cache.get_value(result_key, expires=True)
+    if result is not None:
+        return result
+
+    lock_timeout = cint(frappe.conf.get("cash_flow_coalesce_lock_timeout")) or DEFAULT_LOCK_TIMEOUT
+    lock = frappe.cache.lock(frappe.cache.make_key(LOCK_KEY.format(key)), timeout=lock_timeout)
+
+    if not lock.acquire(blocking=False):
+        result = wait_for_result(result_key, lock, lock_timeout)
+        if result is not None:
+            return result
+
+        return method(*args, **kwargs)
+
+    try:
+        result = method(*args, **kwargs)
+        frappe.cache.set_value(
+            result_key,
+            result,
+            expires_in_sec=cint(frappe.conf.get("cash_flow_coalesce_result_ttl")) or DEFAULT_RESULT_TTL,
+        )
+        frappe.cache.sadd(RESULT_INDEX_KEY, result_key)
+        return result
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            # the lock expired during a long computation
+            pass
+
+
+def wait_for_result(result_key, lock, timeout):
+    """Result published under `result_key`, or None once the lock is free without one."""
+    deadline = time() + timeout
+    while time() < deadline:
+        result = frappe.cache.get_value(result_key, expires=True)
+        if result is not None:
+            return result
+
+        if not lock.locked():
+            # released between the two checks: the result may just have been published
+            return frappe.cache.get_value(result_key, expires=True)
+
+        sleep(POLL_INTERVAL)
+
+
+def clear_coalesced_results():
+    """Drop every published result, e.g. after a ledger change."""
+    result_keys = [frappe.safe_decode(key) for key in frappe.cache.smembers(RESULT_INDEX_KEY) or ()]
+    frappe.cache.delete_value([*result_keys, RESULT_INDEX_KEY])
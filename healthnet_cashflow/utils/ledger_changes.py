@@ -0,0 +1,59 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+from functools import partial
+
+import frappe
+from frappe.utils import getdate
+
+
+def on_gl_entry_change(doc, method=None):
+    """GL Entry / Period Closing Voucher on_submit / on_cancel: remember the company and date touched."""
+    record_ledger_change(doc.company, doc.posting_date)
+
+
+def on_account_change(doc, method=None, *args, **kwargs):
+    """Account changes (type, parent, name) can move any row of any period of the company."""
+    record_ledger_change(doc.company)
+
+
+def record_ledger_change(company, posting_date=None):
+    """
+    Collect ledger changes of the current transaction. They are processed once,
+    just before the transaction commits, and discarded on rollback.
+
+    `posting_date` is the earliest date affected; None means every date.
+    """
+    changes = frappe.local.flags.get("cash_flow_ledger_changes")
+
+    if changes is None:
+        changes = frappe.local.flags.cash_flow_ledger_changes = {}
+        frappe.db.before_commit.add(flush_ledger_changes)
+        frappe.db.after_rollback.add(discard_ledger_changes)
+
+    posting_date = getdate(posting_date) if posting_date else None
+    if company in changes:
+        current = changes[company]
+        posting_date = None if current is None or posting_date is None else min(current, posting_date)
+
+    changes[company] = posting_date
+
+
+def flush_ledger_changes():
+    from healthnet_cashflow.utils.coalesce import clear_coalesced_results
+    from healthnet_cashflow.utils.prepared_report import enqueue_prepared_report_invalidation
+    from healthnet_cashflow.utils.result_cache import invalidate_cached_results
+
+    changes = frappe.local.flags.pop("cash_flow_ledger_changes", None) or {}
+    if changes:
+        frappe.db.after_commit.add(clear_coalesced_results)
+
+    for company, from_date in changes.items():
+        # outside the posting transaction: reading and deleting reports is not the poster's cost
+        enqueue_prepared_report_invalidation(company, from_date)
+        # after the commit, so a report run in between cannot cache the old ledger
+        frappe.db.after_commit.add(partial(invalidate_cached_results, company, from_date))
+
+
+def discard_ledger_changes():
+    frappe.local.flags.pop("cash_flow_ledger_changes", None)
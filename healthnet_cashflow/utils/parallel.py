@@ -0,0 +1,54 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+from frappe.utils import cint
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def run_in_parallel(method, args_list, max_workers=None):
+    """
+    Call `method(*args)` for every entry of `args_list` and return the results in
+    order.
+
+    Each call runs in a worker thread with its own site context and database
+    connection, as the current user and in the current language. With a single
+    unit of work, one worker (`cash_flow_workers` site config), in tests or when
+    already inside a worker (e.g. a multi-year report of one company in a
+    consolidated report), the calls run one after the other on the current
+    connection instead.
+    """
+    args_list = list(args_list)
+    max_workers = max_workers or cint(frappe.conf.get("cash_flow_workers")) or DEFAULT_MAX_WORKERS
+    max_workers = min(max_workers, len(args_list))
+
+    if max_workers <= 1 or frappe.flags.in_test or frappe.flags.cash_flow_worker:
+        return [method(*args) for args in args_list]
+
+    site, sites_path, user, lang = (
+        frappe.local.site,
+        frappe.local.sites_path,
+        frappe.session.user,
+        frappe.local.lang,
+    )
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cash_flow") as executor:
+        futures = [
+            executor.submit(_run_with_connection, site, sites_path, user, lang, method, args) for args in args_list
+        ]
+        return [future.result() for future in futures]
+
+
+def _run_with_connection(site, sites_path, user, lang, method, args):
+    frappe.init(site=site, sites_path=sites_path)
+    try:
+        frappe.connect()
+        frappe.set_user(user)
+        frappe.local.lang = lang
+        frappe.flags.cash_flow_worker = True
+        return method(*args)
+    finally:
+        frappe.destroy()
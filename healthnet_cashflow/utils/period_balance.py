@@ -0,0 +1,182 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+"""
+Cash Flow Period Balance: daily debit/credit totals per company, account,
+finance book, cost center, project and opening flag (the report treats
+opening entries as opening balance whatever their posting date).
+
+The table is kept up to date from GL Entry on_submit / on_cancel and rebuilt
+from the ledger by the patch and the daily scheduler job. Period Closing
+Voucher entries are left out, as the cash flow report ignores them.
+
+Ledger reposts (Repost Item Valuation, Repost Accounting Ledger) delete GL
+Entries without document events and submit them again, so the table would
+count the reposted entries twice. Submitting a repost marks the company as
+stale: the report reads GL Entry for it until the hourly job has rebuilt the
+company once its reposts are done.
+"""
+
+import hashlib
+
+import frappe
+from frappe.utils import add_to_date, cint, cstr, flt, get_datetime, now, now_datetime
+
+PERIOD_BALANCE_READY_KEY = "cash_flow_period_balance_ready"
+STALE_KEY = "cash_flow_period_balance_stale::{0}"
+KEY_FIELDS = ("company", "account", "finance_book", "cost_center", "project", "is_opening", "posting_date")
+# key fields that may be empty: stored as NULL whether GL Entry has NULL or ''
+OPTIONAL_FIELDS = ("finance_book", "cost_center", "project")
+# time a repost is given to run (Repost Accounting Ledger has no status to wait for)
+REPOST_SETTLE_MINUTES = 60
+
+
+def is_period_balance_ready():
+    return cint(frappe.db.get_default(PERIOD_BALANCE_READY_KEY))
+
+
+def is_stale(company):
+    return bool(company and frappe.db.get_default(STALE_KEY.format(company)))
+
+
+def get_ledger_source(gl_entry_only=False, company=None):
+    """
+    Table and condition the report aggregates ledger amounts from. Queries
+    filtering on accounting dimensions (not kept in the period balance table)
+    pass `gl_entry_only`; a company with a pending repost reads GL Entry too.
+    """
+    if is_period_balance_ready() and not gl_entry_only and not is_stale(company):
+        return "`tabCash Flow Period Balance`", ""
+
+    return "`tabGL Entry`", " and is_cancelled = 0 and voucher_type != 'Period Closing Voucher'"
+
+
+def on_gl_entry_submit(doc, method=None):
+    update_period_balance(doc, 1)
+
+
+def on_gl_entry_cancel(doc, method=None):
+    update_period_balance(doc, -1)
+
+
+def on_repost_submit(doc, method=None):
+    """Repost Item Valuation / Repost Accounting Ledger on_submit."""
+    frappe.db.set_default(STALE_KEY.format(doc.company), now())
+
+
+def is_repost_settled(company):
+    """Whether the reposts that made `company` stale are done (rebuilding now is final)."""
+    marked_at = frappe.db.get_default(STALE_KEY.format(company))
+    if get_datetime(marked_at) > add_to_date(now_datetime(), minutes=-REPOST_SETTLE_MINUTES):
+        return False
+
+    return not frappe.db.exists(
+        "Repost Item Valuation",
+        {"company": company, "docstatus": 1, "status": ("in", ("Queued", "In Progress"))},
+    )
+
+
+def rebuild_stale_period_balances():
+    """Hourly scheduler job: rebuild the stale companies whose reposts are done."""
+    for company in frappe.get_all("Company", pluck="name"):
+        if is_stale(company) and is_repost_settled(company):
+            rebuild_period_balances(company)
+            frappe.db.commit()
+
+
+def update_period_balance(gl_entry, sign):
+    if gl_entry.voucher_type == "Period Closing Voucher":
+        return
+
+    debit, credit = flt(gl_entry.debit) * sign, flt(gl_entry.credit) * sign
+    if not debit and not credit:
+        return
+
+    values = {field: gl_entry.get(field) for field in KEY_FIELDS}
+    values.update({field: values[field] or None for field in OPTIONAL_FIELDS})
+    values["is_opening"] = values["is_opening"] or "No"
+    values.update(
+        {
+            "name": get_period_balance_name(*(values[field] for field in KEY_FIELDS)),
+            "debit": debit,
+            "credit": credit,
+            "now": now(),
+            "user": frappe.session.user,
+        }
+    )
+
+    if frappe.db.db_type == "postgres":
+        on_conflict = """on conflict (name) do update set
+            debit = "tabCash Flow Period Balance".debit + excluded.debit,
+            credit = "tabCash Flow Period Balance".credit + excluded.credit,
+            modified = excluded.modified"""
+    else:
+        on_conflict = """on duplicate key update
+            debit = debit + values(debit),
+            credit = credit + values(credit),
+            modified = values(modified)"""
+
+    frappe.db.sql(
+        f"""
+        insert into `tabCash Flow Period Balance`
+            (name, creation, modified, owner, modified_by, docstatus,
+            company, account, finance_book, cost_center, project, is_opening, posting_date, debit, credit)
+        values
+            (%(name)s, %(now)s, %(now)s, %(user)s, %(user)s, 0,
+            %(company)s, %(account)s, %(finance_book)s, %(cost_center)s, %(project)s, %(is_opening)s,
+            %(posting_date)s, %(debit)s, %(credit)s)
+        {on_conflict}
+    """,
+        values,
+    )
+
+
+def get_period_balance_name(company, account, finance_book, cost_center, project, is_opening, posting_date):
+    key = "::".join(
+        cstr(value) for value in (company, account, finance_book, cost_center, project, is_opening, posting_date)
+    )
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def rebuild_period_balances(company=None):
+    """Recompute the table for `company` (or every company) from GL Entry."""
+    conditions = " and company = %(company)s" if company else ""
+    # NULL and '' are the same key (as in update_period_balance), stored as NULL;
+    # a missing opening flag is "No"
+    fields = [f"nullif({field}, '')" if field in OPTIONAL_FIELDS else field for field in KEY_FIELDS]
+    fields[KEY_FIELDS.index("is_opening")] = "coalesce(nullif(is_opening, ''), 'No')"
+    name_key = "concat_ws('::', {})".format(
+        ", ".join(f"coalesce(cast({field} as char), '')" for field in fields)
+    )
+    if frappe.db.db_type == "postgres":
+        name_key = name_key.replace("as char", "as text")
+
+    frappe.db.sql(
+        f"delete from `tabCash Flow Period Balance` where 1=1 {conditions}", {"company": company}
+    )
+    frappe.db.sql(
+        f"""
+        insert into `tabCash Flow Period Balance`
+            (name, creation, modified, owner, modified_by, docstatus,
+            company, account, finance_book, cost_center, project, is_opening, posting_date, debit, credit)
+        select md5({name_key}), %(now)s, %(now)s, 'Administrator', 'Administrator', 0,
+            {", ".join(fields)}, sum(debit), sum(credit)
+        from `tabGL Entry`
+        where is_cancelled = 0 and voucher_type != 'Period Closing Voucher' {conditions}
+        group by {", ".join(fields)}
+    """,
+        {"company": company, "now": now()},
+    )
+
+    frappe.db.set_default(PERIOD_BALANCE_READY_KEY, 1)
+
+    for name in [company] if company else frappe.get_all("Company", pluck="name"):
+        if is_stale(name) and is_repost_settled(name):
+            frappe.db.set_default(STALE_KEY.format(name), "")
+
+
+def rebuild_all_period_balances():
+    """Daily scheduler job."""
+    for company in frappe.get_all("Company", pluck="name"):
+        rebuild_period_balances(company)
+        frappe.db.commit()
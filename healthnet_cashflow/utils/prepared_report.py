@@ -0,0 +1,113 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import getdate
+
+from healthnet_cashflow.healthnet_cashflow.report.custom_cash_flow.consolidated import get_consolidated_companies
+
+PREPARED_REPORTS = ("Custom Cash Flow", "Trial Balance", "Profit and Loss Statement")
+
+
+def run_in_background(report_name, filters):
+    """
+    Result of the latest completed Prepared Report of `report_name` for `filters`.
+
+    When there is none, a Prepared Report is queued (unless one is already
+    queued) and `{"prepared_report": True, "status": ...}` is returned so the
+    caller can poll again.
+    """
+    from frappe.core.doctype.prepared_report.prepared_report import (
+        make_prepared_report,
+        process_filters_for_prepared_report,
+    )
+    from frappe.desk.query_report import get_prepared_report_result
+
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+
+    report = frappe.get_doc("Report", report_name)
+    if not report.is_permitted():
+        frappe.throw(_("You don't have access to Report: {0}").format(report_name), frappe.PermissionError)
+
+    result = get_prepared_report_result(report, filters, user=frappe.session.user)
+    if result.get("doc"):
+        return result
+
+    queued = frappe.db.get_value(
+        "Prepared Report",
+        {
+            "report_name": report_name,
+            "filters": process_filters_for_prepared_report(filters),
+            "status": ("in", ("Queued", "Started")),
+        },
+        ["name", "status"],
+        as_dict=True,
+    )
+    if not queued:
+        queued = frappe._dict(make_prepared_report(report_name, filters), status="Queued")
+
+    return {"prepared_report": True, "name": queued.name, "status": queued.status}
+
+
+def enqueue_prepared_report_invalidation(company, from_date=None):
+    """Invalidate the Prepared Reports of `company` in a background job, once the posting has committed."""
+    frappe.enqueue(
+        "healthnet_cashflow.utils.prepared_report.invalidate_prepared_reports",
+        queue="short",
+        enqueue_after_commit=True,
+        company=company,
+        from_date=from_date,
+    )
+
+
+def invalidate_prepared_reports(company, from_date=None):
+    """
+    Delete completed Prepared Reports of `company` whose period ends on or after
+    `from_date`. Ledger changes before a report's period still move its opening
+    balances, so only reports ending earlier are kept.
+
+    Only reports whose filters mention the company or one of its parents (a
+    consolidated report) are read; reports without a company filter are
+    always invalidated.
+    """
+    candidates = [company, *frappe.db.get_ancestors_of("Company", company)]
+    or_filters = [["filters", "like", f'%"{name}"%'] for name in candidates]
+    or_filters.append(["filters", "not like", '%"company"%'])
+
+    for prepared_report in frappe.get_all(
+        "Prepared Report",
+        filters={"report_name": ("in", PREPARED_REPORTS), "status": "Completed"},
+        or_filters=or_filters,
+        fields=["name", "filters"],
+    ):
+        filters = frappe._dict(json.loads(prepared_report.filters or "{}"))
+        companies = get_companies(filters)
+        if companies and company not in companies:
+            continue
+
+        end_date = get_report_end_date(filters)
+        if from_date and end_date and end_date < getdate(from_date):
+            continue
+
+        frappe.delete_doc("Prepared Report", prepared_report.name, ignore_permissions=True)
+
+
+def get_companies(filters):
+    """Companies whose ledger a report reads: the consolidated companies, or the selected company."""
+    return get_consolidated_companies(filters) or [company for company in [filters.company] if company]
+
+
+def get_report_end_date(filters):
+    if filters.to_date:
+        return getdate(filters.to_date)
+
+    if filters.filter_based_on == "Fiscal Year" and filters.to_fiscal_year:
+        year_end_date = frappe.get_cached_value("Fiscal Year", filters.to_fiscal_year, "year_end_date")
+        return getdate(year_end_date) if year_end_date else None
+
+    if filters.period_end_date:
+        return getdate(filters.period_end_date)
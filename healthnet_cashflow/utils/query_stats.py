@@ -0,0 +1,49 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+from time import perf_counter
+
+import frappe
+
+
+class QueryStats:
+    """
+    Count the SQL queries, rows and SQL time spent inside a `with` block.
+
+    `frappe.db.sql` is wrapped for the duration of the block, so queries made
+    through frappe.qb and frappe.get_all are counted too. Recorders can be
+    nested; an inner block's queries also count towards the outer ones.
+    """
+
+    def __init__(self, capture_queries=False):
+        self.capture_queries = capture_queries
+        self.count = 0
+        self.rows = 0
+        self.time = 0.0
+        self.queries = []
+        self._previous_sql = None
+
+    def __enter__(self):
+        self._previous_sql = frappe.db.sql
+        frappe.db.sql = self._sql
+        return self
+
+    def __exit__(self, *exc_info):
+        frappe.db.sql = self._previous_sql
+
+    def _sql(self, query, values=(), *args, **kwargs):
+        start = perf_counter()
+        result = None
+        try:
+            result = self._previous_sql(query, values, *args, **kwargs)
+            return result
+        finally:
+            self.count += 1
+            self.time += perf_counter() - start
+            if isinstance(result, list | tuple):
+                self.rows += len(result)
+            if self.capture_queries:
+                self.queries.append((query, values))
+
+    def as_dict(self):
+        return {"queries": self.count, "rows": self.rows, "sql_time": round(self.time, 6)}
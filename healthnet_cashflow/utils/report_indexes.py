@@ -0,0 +1,77 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+import frappe
+
+from healthnet_cashflow.utils.query_stats import QueryStats
+
+# (doctype, columns, index name) for the report's ledger and account lookups:
+# - the ledger scan: company, posting_date range, then account / cancelled filters
+# - account filtered queries: account in (...) over a posting_date range
+# - cost center / project filtered reports: dimension in (...) over a posting_date range
+# - account type lookups, with or without the company
+REPORT_INDEXES = (
+    ("GL Entry", ["company", "posting_date", "account", "is_cancelled"], "cash_flow_company_posting_date"),
+    ("GL Entry", ["company", "account", "posting_date"], "cash_flow_company_account_posting_date"),
+    ("GL Entry", ["company", "cost_center", "posting_date"], "cash_flow_company_cost_center_posting_date"),
+    ("GL Entry", ["company", "project", "posting_date"], "cash_flow_company_project_posting_date"),
+    (
+        "Cash Flow Period Balance",
+        ["company", "cost_center", "posting_date"],
+        "cash_flow_company_cost_center_posting_date",
+    ),
+    ("Cash Flow Period Balance", ["company", "project", "posting_date"], "cash_flow_company_project_posting_date"),
+    ("Account", ["account_type", "company"], "cash_flow_account_type_company"),
+)
+
+
+def add_report_indexes():
+    for doctype, columns, index_name in REPORT_INDEXES:
+        frappe.db.add_index(doctype, columns, index_name)
+
+
+def check_report_queries(filters, report="Custom Cash Flow"):
+    """
+    Run `report` with `filters`, EXPLAIN every select it made and return the
+    ones with a full table scan:
+    `[{"query": ..., "table": ..., "rows": ..., "plan": [...]}]`.
+    """
+    from frappe.desk.query_report import generate_report_result
+
+    report_doc = frappe.get_doc("Report", report)
+    filters = frappe.parse_json(filters) if isinstance(filters, str) else filters
+
+    # a cached result (or request cache) would hide the ledger queries
+    frappe.local.request_cache.clear()
+    frappe.flags.cash_flow_skip_result_cache = True
+    try:
+        with QueryStats(capture_queries=True) as stats:
+            generate_report_result(report_doc, filters=filters, user=frappe.session.user)
+    finally:
+        frappe.flags.cash_flow_skip_result_cache = False
+
+    full_scans = []
+    seen = set()
+    for query, values in stats.queries:
+        if not query.lstrip().lower().startswith("select"):
+            continue
+
+        explain_query = frappe.db.mogrify(query, values) if values else query
+        if explain_query in seen:
+            continue
+        seen.add(explain_query)
+
+        plan = frappe.db.sql(f"explain {explain_query}", as_dict=True)
+        for table, rows in get_full_scans(plan):
+            full_scans.append({"query": " ".join(query.split()), "table": table, "rows": rows, "plan": plan})
+
+    return full_scans
+
+
+def get_full_scans(plan):
+    """(table, estimated rows) of the full table scans in an EXPLAIN result."""
+    if frappe.db.db_type == "postgres":
+        lines = [row.get("QUERY PLAN") or "" for row in plan]
+        return [(line.split("Seq Scan on", 1)[1].split()[0], None) for line in lines if "Seq Scan on" in line]
+
+    return [(row.get("table"), row.get("rows")) for row in plan if row.get("type") == "ALL"]
@@ -0,0 +1,65 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+"""
+Columnar payload of a report result, for API clients that poll large reports.
+
+Instead of one dict per row repeating every key, the payload carries a row
+metadata table (one list of field values per row), a dense rows x columns
+matrix of the numeric columns and the currency once. Blank spacer rows are
+dropped and recorded by position.
+"""
+
+import frappe
+from frappe import _
+
+PAYLOAD_FORMATS = ("dict", "columnar")
+
+
+def validate_payload_format(payload_format):
+    if payload_format not in PAYLOAD_FORMATS:
+        frappe.throw(_("Payload format must be one of {0}").format(", ".join(PAYLOAD_FORMATS)))
+
+
+def to_columnar(result):
+    """
+    Columnar form of a `frappe.desk.query_report.run` result: the numeric
+    columns (all but the label and currency columns) become `values`, every
+    other row key a `row_fields` column; `spacers` are the positions of the
+    dropped blank rows in the original data.
+    """
+    columns = result.get("columns") or []
+    value_columns = [column for column in columns[2:] if isinstance(column, dict)]
+    value_fieldnames = [column["fieldname"] for column in value_columns]
+
+    data = result.get("result") or []
+    value_keys = set(value_fieldnames)
+    row_fields = []
+    currency = None
+
+    for row in data:
+        for key in row or {}:
+            if key not in value_keys and key != "currency" and key not in row_fields:
+                row_fields.append(key)
+        currency = currency or (row or {}).get("currency")
+
+    rows, values, spacers = [], [], []
+    for idx, row in enumerate(data):
+        if not row:
+            spacers.append(idx)
+            continue
+
+        rows.append([row.get(field) for field in row_fields] + [1 if row.get("currency") else 0])
+        values.append([row.get(fieldname) for fieldname in value_fieldnames])
+
+    return {
+        "format": "columnar",
+        "columns": columns[:2],
+        "value_columns": value_columns,
+        "currency": currency,
+        "row_fields": [*row_fields, "has_currency"],
+        "rows": rows,
+        "values": values,
+        "spacers": spacers,
+        **{key: value for key, value in result.items() if key not in ("columns", "result")},
+    }
@@ -0,0 +1,124 @@
+# Copyright (c) 2026, HealthNet Cashflow and contributors
+# For license information, please see license.txt
+
+"""
+Cross-request cache of Custom Cash Flow results, keyed by the normalized filters.
+
+Results are kept in Redis with a small index entry (companies, report end date,
+creation time) per key, in one index hash per company. Ledger changes recorded
+by `ledger_changes` read only the index of the changed company and drop its
+entries whose period ends on or after the change.
+"""
+
+import hashlib
+import json
+from time import time
+
+import frappe
+from frappe.utils import cint, getdate
+
+from healthnet_cashflow.utils.prepared_report import get_companies, get_report_end_date
+
+RESULT_CACHE_KEY = "healthnet_cashflow:cash_flow_result"
+RESULT_INDEX_KEY = "healthnet_cashflow:cash_flow_result_index"
+INVALIDATED_KEY = "healthnet_cashflow:cash_flow_result_invalidated"
+DEFAULT_TTL = 24 * 60 * 60
+
+# filters that do not change the result, or whose result must not be shared
+IGNORED_FILTERS = ("debug_trace", "debug_profile")
+
+
+def is_cacheable(filters):
+    if frappe.flags.cash_flow_skip_result_cache or cint(frappe.conf.get("cash_flow_disable_result_cache")):
+        return False
+
+    return not any(cint(filters.get(key)) for key in IGNORED_FILTERS)
+
+
+def get_index_key(company):
+    return f"{RESULT_INDEX_KEY}:{company}"
+
+
+def get_cache_key(filters):
+    normalized = {
+        key: sorted(value) if isinstance(value, list | tuple) else value
+        for key, value in filters.items()
+        if key not in IGNORED_FILTERS and value not in (None, "", [], 0)
+    }
+    return hashlib.md5(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_result_key(filters):
+    """Cache key of a report run: the filters and the language its labels are translated to."""
+    return get_cache_key({**filters, "lang": frappe.local.lang})
+
+
+def get_cached_result(filters):
+    """Cached result of a report run with `filters`, or None."""
+    if not is_cacheable(filters):
+        return None
+
+    key = get_result_key(filters)
+    entry = frappe.cache.hget(get_index_key(filters.company), key)
+    if not entry:
+        return None
+
+    ttl = cint(frappe.conf.get("cash_flow_result_cache_ttl")) or DEFAULT_TTL
+    if entry["created"] + ttl < time():
+        delete_results({key: entry["companies"]})
+        return None
+
+    return frappe.cache.hget(RESULT_CACHE_KEY, key)
+
+
+def set_cached_result(filters, result, started):
+    """
+    Cache `result` of a report run with `filters` that started at `started`
+    (`time()`), unless one of its companies' ledgers changed since.
+    """
+    if not is_cacheable(filters):
+        return
+
+    companies = get_companies(filters)
+    for company in companies:
+        invalidated = frappe.cache.hget(INVALIDATED_KEY, company)
+        if invalidated and invalidated >= started:
+            return
+
+    end_date = get_report_end_date(filters)
+    key = get_result_key(filters)
+    entry = {"companies": companies, "end_date": end_date, "created": time()}
+
+    frappe.cache.hset(RESULT_CACHE_KEY, key, result)
+    for company in companies:
+        frappe.cache.hset(get_index_key(company), key, entry)
+
+
+def invalidate_cached_results(company, from_date=None):
+    """
+    Drop cached results of `company` whose period ends on or after `from_date`
+    (every result of the company without a date).
+    """
+    frappe.cache.hset(INVALIDATED_KEY, company, time())
+
+    entries = {}
+    for key, entry in (frappe.cache.hgetall(get_index_key(company)) or {}).items():
+        if from_date and entry["end_date"] and entry["end_date"] < getdate(from_date):
+            continue
+
+        entries[frappe.safe_decode(key)] = entry["companies"]
+
+    delete_results(entries)
+
+
+def delete_results(entries):
+    """Drop the results of `entries`, {key: companies}, and their index entries."""
+    for key, companies in entries.items():
+        for company in companies:
+            frappe.cache.hdel(get_index_key(company), key)
+        frappe.cache.hdel(RESULT_CACHE_KEY, key)
+
+
+def clear_result_cache():
+    frappe.cache.delete_keys(f"{RESULT_INDEX_KEY}:")
+    frappe.cache.delete_value(RESULT_CACHE_KEY)